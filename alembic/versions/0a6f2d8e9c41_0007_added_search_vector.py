@@ -0,0 +1,61 @@
+"""0007 Added search vector.
+
+Revision ID: 0a6f2d8e9c41
+Revises: e7b14c93a0d6
+Create Date: 2026-10-17 13:41:55.287330
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+from sqlalchemy.dialects import postgresql
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "0a6f2d8e9c41"
+down_revision: str | None = "e7b14c93a0d6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of the default `[search] languages`, the backfill must not follow later settings.
+# Run `hispanie-reindex-search` after changing them.
+LANGUAGES = ("spanish", "french", "english")
+
+
+def _document(table: str, tag_table: str) -> str:
+    """Return the SQL of `search_document` as of this revision."""
+    tags = (
+        f"(SELECT string_agg(tag.name, ' ') FROM {tag_table}"
+        f" JOIN tag ON tag.id = {tag_table}.tag_id"
+        f" WHERE {tag_table}.{table}_id = {table}.id)"
+    )
+    parts = (
+        (f"{table}.name", "A"),
+        (tags, "B"),
+        (f"{table}.description", "C"),
+        (f"{table}.city", "D"),
+    )
+    return " || ".join(
+        f"setweight(to_tsvector('{lang}', coalesce({text}, '')), '{weight}')"
+        for lang in LANGUAGES
+        for text, weight in parts
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("event", "business"):
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.execute(f"UPDATE {table} SET search_vector = {_document(table, f'{table}_tag')}")
+        op.create_index(
+            f"ix_{table}_search_vector", table, ["search_vector"], postgresql_using="gin"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("business", "event"):
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,49 @@
+"""0011 Added keyset indexes.
+
+Revision ID: 11cd70831518
+Revises: f2e8d6a41c07
+Create Date: 2026-10-17 19:41:52.208317
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "11cd70831518"
+down_revision: str | None = "f2e8d6a41c07"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Default sort key of the pages, events are sorted by the existing start_date index
+TABLES = ("business", "file", "tag")
+COLUMNS = ["creation_date", "id"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built without locking the tables against writes, which cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f"ix_{table}_creation_date_id",
+                table,
+                COLUMNS,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.drop_index(
+                f"ix_{table}_creation_date_id",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,45 @@
+"""0005 Added earth location indexes.
+
+Revision ID: 5c0e9a2b4f18
+Revises: d3a81f60b7c5
+Create Date: 2026-10-17 11:26:03.904116
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "5c0e9a2b4f18"
+down_revision: str | None = "d3a81f60b7c5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+    op.create_index(
+        "ix_event_earth_location",
+        "event",
+        [sa.text("ll_to_earth(latitude, longitude)")],
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "ix_business_earth_location",
+        "business",
+        [sa.text("ll_to_earth(latitude, longitude)")],
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_business_earth_location", table_name="business")
+    op.drop_index("ix_event_earth_location", table_name="event")
+    op.execute("DROP EXTENSION IF EXISTS earthdistance")
+    op.execute("DROP EXTENSION IF EXISTS cube")
@@ -0,0 +1,61 @@
+"""0008 Added autocomplete.
+
+Revision ID: 7d25e1b8f3a9
+Revises: 0a6f2d8e9c41
+Create Date: 2026-10-17 14:52:10.733418
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "7d25e1b8f3a9"
+down_revision: str | None = "0a6f2d8e9c41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Frozen copy of `hispanie.model.autocomplete_term.AUTOCOMPLETE_TERM_DDL` at this revision, the
+# migration must not follow later changes of the view. Change both in a new revision.
+AUTOCOMPLETE_TERM_DDL = (
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS autocomplete_term AS
+    SELECT 'tag' AS kind, tag.name AS term, tag.id AS ref_id,
+        (SELECT count(*) FROM event_tag WHERE event_tag.tag_id = tag.id)
+        + (SELECT count(*) FROM business_tag WHERE business_tag.tag_id = tag.id) AS popularity
+    FROM tag
+    UNION ALL
+    SELECT 'city', city, NULL, count(*)
+    FROM (SELECT trim(city) AS city FROM event UNION ALL SELECT trim(city) FROM business) AS c
+    WHERE city <> ''
+    GROUP BY city
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_autocomplete_term_kind_term "
+    "ON autocomplete_term (kind, term)",
+    "CREATE INDEX IF NOT EXISTS ix_autocomplete_term_term_trgm "
+    "ON autocomplete_term USING gin (term gin_trgm_ops)",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_event_name_trgm",
+        "event",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    for statement in AUTOCOMPLETE_TERM_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW autocomplete_term")
+    op.drop_index("ix_event_name_trgm", table_name="event")
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
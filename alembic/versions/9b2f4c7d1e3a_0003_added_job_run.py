@@ -0,0 +1,42 @@
+"""0003 Added job run.
+
+Revision ID: 9b2f4c7d1e3a
+Revises: 4e5378918657
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2f4c7d1e3a"
+down_revision: str | None = "4e5378918657"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "job_run",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("last_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_duration", sa.Float(), nullable=False),
+        sa.Column("last_status", sa.String(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("runs", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("creation_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("update_date", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_job_run")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_run")
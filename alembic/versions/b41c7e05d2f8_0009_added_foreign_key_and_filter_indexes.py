@@ -0,0 +1,67 @@
+"""0009 Added foreign key and filter indexes.
+
+Revision ID: b41c7e05d2f8
+Revises: 7d25e1b8f3a9
+Create Date: 2026-10-17 16:20:36.148902
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "b41c7e05d2f8"
+down_revision: str | None = "7d25e1b8f3a9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, columns, extra index arguments), activity and ticket are served by the unique
+# (event_id, name) constraints
+INDEXES: list[tuple[str, list[str], dict]] = [
+    ("event", ["account_id"], {}),
+    ("event", ["start_date"], {}),
+    ("event", ["is_public", "start_date"], {}),
+    ("event", ["frequency"], {"postgresql_where": sa.text("frequency <> 'NONE'")}),
+    ("business", ["account_id"], {}),
+    ("file", ["account_id"], {}),
+    ("file", ["event_id"], {}),
+    ("file", ["business_id"], {}),
+    ("social_network", ["business_id"], {}),
+    ("reset_token", ["account_id"], {}),
+    ("event_tag", ["tag_id"], {}),
+    ("business_tag", ["tag_id"], {}),
+]
+
+
+def _name(table: str, columns: list[str]) -> str:
+    return f"ix_{table}_{'_'.join(columns)}"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built without locking the tables against writes, which cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for table, columns, kwargs in INDEXES:
+            op.create_index(
+                _name(table, columns),
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table, columns, _ in reversed(INDEXES):
+            op.drop_index(
+                _name(table, columns),
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,50 @@
+"""0004 Added event occurrence.
+
+Revision ID: d3a81f60b7c5
+Revises: 9b2f4c7d1e3a
+Create Date: 2026-10-17 10:04:19.552871
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a81f60b7c5"
+down_revision: str | None = "9b2f4c7d1e3a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "event_occurrence",
+        sa.Column("event_id", sa.String(), nullable=False),
+        sa.Column("start_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_date", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["event_id"],
+            ["event.id"],
+            name=op.f("fk_event_occurrence_event_id_event"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("event_id", "start_date", name=op.f("pk_event_occurrence")),
+    )
+    op.create_index(
+        "ix_event_occurrence_start_date", "event_occurrence", ["start_date", "event_id"]
+    )
+    # One-off events are only materialized when written, recurring ones by the scheduled job
+    op.execute(
+        "INSERT INTO event_occurrence (event_id, start_date, end_date) "
+        "SELECT id, start_date, end_date FROM event WHERE frequency = 'NONE'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_event_occurrence_start_date", table_name="event_occurrence")
+    op.drop_table("event_occurrence")
@@ -0,0 +1,38 @@
+"""0006 Added point indexes.
+
+Revision ID: e7b14c93a0d6
+Revises: 5c0e9a2b4f18
+Create Date: 2026-10-17 12:08:47.615290
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b14c93a0d6"
+down_revision: str | None = "5c0e9a2b4f18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_event_point", "event", [sa.text("point(longitude, latitude)")], postgresql_using="gist"
+    )
+    op.create_index(
+        "ix_business_point",
+        "business",
+        [sa.text("point(longitude, latitude)")],
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_business_point", table_name="business")
+    op.drop_index("ix_event_point", table_name="event")
@@ -0,0 +1,49 @@
+"""0010 Added on delete cascade.
+
+Revision ID: f2e8d6a41c07
+Revises: b41c7e05d2f8
+Create Date: 2026-10-17 18:03:27.591064
+
+"""
+
+from typing import Sequence
+
+import sqlalchemy as sa  # noqa: F401
+
+from alembic import op  # noqa: F401
+
+# revision identifiers, used by Alembic.
+revision: str = "f2e8d6a41c07"
+down_revision: str | None = "b41c7e05d2f8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, column, referred table) of the children removed with their parent row
+FOREIGN_KEYS = [
+    ("activity", "event_id", "event"),
+    ("ticket", "event_id", "event"),
+    ("file", "event_id", "event"),
+    ("event_tag", "event_id", "event"),
+    ("file", "business_id", "business"),
+    ("social_network", "business_id", "business"),
+    ("business_tag", "business_id", "business"),
+]
+
+
+def _recreate(ondelete: str | None) -> None:
+    for table, column, referred in FOREIGN_KEYS:
+        name = f"fk_{table}_{column}_{referred}"
+        # Databases created before the naming convention have the default constraint names
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_{column}_fkey")
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {name}")
+        op.create_foreign_key(name, table, referred, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate("CASCADE")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate(None)
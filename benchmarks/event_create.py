@@ -0,0 +1,113 @@
+"""Measure the commits and latency of creating an event with 10 files and 20 tickets.
+
+Compares the former path, committing every file before the event, with `create_event`, which
+flushes the whole aggregate in one transaction. Runs against the database of hispanie.ini with a
+throwaway account deleted at the end.
+
+    python benchmarks/event_create.py --runs 50
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event as sqla_event
+
+from hispanie.action import create_event
+from hispanie.db import unit_of_work
+from hispanie.model import Account, AccountType, Event, File, Ticket
+from hispanie.schema import EventCreateRequest
+from hispanie.utils import idun
+
+FILES = 10
+TICKETS = 20
+
+
+def event_data() -> EventCreateRequest:
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    return EventCreateRequest(
+        name="Benchmark concert",
+        city="Paris",
+        address="1 rue de la Paix",
+        country="France",
+        municipality="Paris",
+        postcode="75001",
+        region="Ile-de-France",
+        latitude=48.8686,
+        longitude=2.3314,
+        category="concert",
+        frequency="none",
+        start_date=start,
+        end_date=start + timedelta(hours=3),
+        files=[
+            {
+                "filename": f"file{i}.png",
+                "content_type": "image/png",
+                "category": "cover_image",
+                "path": f"events/file{i}.png",
+                "hash": f"hash{i}",
+            }
+            for i in range(FILES)
+        ],
+        tickets=[
+            {"name": f"ticket {i}", "cost": 10.0 + i, "currency": "EUR"} for i in range(TICKETS)
+        ],
+    )
+
+
+def legacy_create(data: EventCreateRequest, account_id: str) -> Event:
+    """Create the event the former way, one commit per file then one for the event."""
+    values = data.model_dump(exclude={"activities", "tags"})
+    files = [File(**file).create() for file in values.pop("files")]
+    tickets = [Ticket(**ticket) for ticket in values.pop("tickets")]
+    return Event(
+        account=Account.get(id=account_id), files=files, tickets=tickets, **values
+    ).create()
+
+
+def measure(name: str, create, account_id: str, runs: int) -> None:
+    commits = 0
+
+    def count(_):
+        nonlocal commits
+        commits += 1
+
+    latencies = []
+    for _ in range(runs):
+        data = event_data()
+        with unit_of_work() as session:
+            # Only the commits of the creation, not the ones of other connections of the engine
+            sqla_event.listen(session, "after_commit", count)
+            start = time.perf_counter()
+            create(data, account_id)
+            latencies.append(time.perf_counter() - start)
+    print(
+        f"{name:>8}: {commits / runs:5.1f} commits/event, "
+        f"median {statistics.median(latencies) * 1000:7.1f} ms, "
+        f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with unit_of_work():
+        account = Account(
+            username=idun("benchmark"),
+            email=f"{idun('benchmark')}@hispanie.com",
+            password="benchmark",
+            type=AccountType.USER,
+        ).create()
+    try:
+        measure("before", legacy_create, account.id, args.runs)
+        measure("after", create_event, account.id, args.runs)
+    finally:
+        with unit_of_work():
+            Account.get(id=account.id).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Compare serializing a page of 1k events through `response_model` and the JSON fast path.
+
+The events are built in memory with 3 activities, 2 tickets, 2 files and 3 tags each, no
+database is needed. `response_model` validates `Page[EventResponse]` from the ORM attributes and
+encodes it the way FastAPI does, `page_json` concatenates the JSON of every event, validated
+once per version of its row.
+
+    python benchmarks/serialize_events.py --events 1000 --runs 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from hispanie.action.serialize import entity_cache, page_json
+from hispanie.model import (
+    Activity,
+    Currency,
+    Event,
+    EventCategory,
+    EventFrequency,
+    File,
+    FileCategory,
+    Tag,
+    Ticket,
+)
+from hispanie.schema import EventResponse, Page
+from hispanie.utils import idun
+
+
+def make_events(count: int) -> list[Event]:
+    now = datetime.now(timezone.utc)
+    tags = [Tag(id=idun("tag"), name=f"tag {i}", creation_date=now) for i in range(20)]
+    events = []
+    for i in range(count):
+        start = now + timedelta(days=i % 365)
+        event_id = idun("event")
+        events.append(
+            Event(
+                id=event_id,
+                name=f"Event {i}",
+                email="event@hispanie.com",
+                phone="+33666666666",
+                address="1 rue de la Paix",
+                country="France",
+                municipality="Paris",
+                city="Paris",
+                postcode="75001",
+                region="Ile-de-France",
+                latitude=48.8686,
+                longitude=2.3314,
+                category=EventCategory.CONCERT,
+                frequency=EventFrequency.NONE,
+                is_public=True,
+                description="A concert " * 20,
+                start_date=start,
+                end_date=start + timedelta(hours=3),
+                creation_date=now,
+                update_date=now,
+                activities=[
+                    Activity(
+                        id=idun("activity"),
+                        name=f"activity {a}",
+                        event_id=event_id,
+                        start_date=start,
+                        end_date=start + timedelta(hours=1),
+                        creation_date=now,
+                    )
+                    for a in range(3)
+                ],
+                tickets=[
+                    Ticket(
+                        id=idun("ticket"),
+                        name=f"ticket {t}",
+                        cost=10.0 + t,
+                        currency=Currency.EUR,
+                        event_id=event_id,
+                        creation_date=now,
+                    )
+                    for t in range(2)
+                ],
+                files=[
+                    File(
+                        id=idun("file"),
+                        path=f"events/{event_id}/{f}.png",
+                        hash=f"hash{f}",
+                        category=FileCategory.COVER_IMAGE,
+                        creation_date=now,
+                    )
+                    for f in range(2)
+                ],
+                tags=[tags[(i + t) % len(tags)] for t in range(3)],
+            )
+        )
+    return events
+
+
+def response_model(events: list[Event]) -> bytes:
+    """Serialize the page as FastAPI does with `response_model=Page[EventResponse]`."""
+    page = Page[EventResponse].model_validate(
+        {"items": events, "next_cursor": None}, from_attributes=True
+    )
+    return json.dumps(
+        page.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def measure(name: str, serialize: Callable[[], Any], runs: int, before: Callable[[], Any]) -> None:
+    latencies = []
+    for _ in range(runs):
+        before()
+        start = time.perf_counter()
+        serialize()
+        latencies.append(time.perf_counter() - start)
+    print(
+        f"{name:>15}: median {statistics.median(latencies) * 1000:7.1f} ms, "
+        f"max {max(latencies) * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    events = make_events(args.events)
+    assert json.loads(response_model(events)) == json.loads(page_json(EventResponse, events, None))
+
+    measure("response_model", lambda: response_model(events), args.runs, lambda: None)
+    measure(
+        "page_json cold",
+        lambda: page_json(EventResponse, events, None),
+        args.runs,
+        entity_cache.clear,
+    )
+    measure(
+        "page_json warm", lambda: page_json(EventResponse, events, None), args.runs, lambda: None
+    )
+
+
+if __name__ == "__main__":
+    main()
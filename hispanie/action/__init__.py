@@ -1,3 +1,4 @@
+from .account import aread as aread_accounts
 from .account import (
     authenticate_account,
     check_account_session,
@@ -6,40 +7,90 @@ from .account import (
     get_current_account,
     handle_forgotten_password,
     handle_reset_password,
+    invalidate_principal,
     is_reset_token_used,
 )
 from .account import create as create_account
 from .account import delete as delete_account
 from .account import read as read_accounts
 from .account import update as update_account
+from .activity import apaginate as apaginate_activities
+from .activity import aread as aread_activities
 from .activity import create as create_activity
 from .activity import delete as delete_activity
 from .activity import read as read_activities
 from .activity import update as update_activity
+from .autocomplete import aautocomplete, refresh_autocomplete_terms
+from .business import anearby as anearby_businesses
+from .business import apaginate as apaginate_businesses
+from .business import aread as aread_businesses
+from .business import aversion as aversion_businesses
 from .business import create as create_business
 from .business import delete as delete_business
 from .business import read as read_businesses
 from .business import update as update_business
+from .cache import acached_item, acached_page, acached_version, invalidate_responses, response_key
+from .event import anearby as anearby_events
+from .event import apaginate as apaginate_events
+from .event import apaginate_occurrences, materialize_occurrences, shift_periodic_events
+from .event import aread as aread_events
+from .event import aversion as aversion_events
 from .event import create as create_event
 from .event import delete as delete_event
 from .event import read as read_events
 from .event import update as update_event
+from .file import apaginate as apaginate_files
+from .file import aread as aread_files
+from .file import aversion as aversion_files
 from .file import create as create_file
 from .file import delete as delete_file
 from .file import generate_download_presigned_url, generate_upload_presigned_url
 from .file import read as read_files
 from .file import update as update_file
+from .map import acluster as acluster_map
+from .search import asearch, refresh_search_vectors
+from .tag import apaginate as apaginate_tags
+from .tag import aread as aread_tags
+from .tag import aversion as aversion_tags
 from .tag import create as create_tag
 from .tag import delete as delete_tag
 from .tag import read as read_tags
 from .tag import update as update_tag
+from .ticket import apaginate as apaginate_tickets
+from .ticket import aread as aread_tickets
 from .ticket import create as create_ticket
 from .ticket import delete as delete_ticket
 from .ticket import read as read_tickets
 from .ticket import update as update_ticket
 
 __all__ = [
+    "aautocomplete",
+    "acached_item",
+    "acached_page",
+    "acached_version",
+    "acluster_map",
+    "anearby_businesses",
+    "anearby_events",
+    "apaginate_activities",
+    "apaginate_businesses",
+    "apaginate_events",
+    "apaginate_files",
+    "apaginate_occurrences",
+    "apaginate_tags",
+    "apaginate_tickets",
+    "aread_accounts",
+    "aread_activities",
+    "aread_businesses",
+    "aread_events",
+    "aread_files",
+    "aread_tags",
+    "aread_tickets",
+    "asearch",
     "authenticate_account",
+    "aversion_businesses",
+    "aversion_events",
+    "aversion_files",
+    "aversion_tags",
     "check_account_session",
     "create_access_token",
     "create_account",
@@ -56,13 +107,16 @@ __all__ = [
     "delete_file",
     "delete_tag",
     "delete_ticket",
+    "generate_download_presigned_url",
     "generate_expiration_time",
     "generate_upload_presigned_url",
-    "generate_download_presigned_url",
     "get_current_account",
     "handle_forgotten_password",
     "handle_reset_password",
+    "invalidate_principal",
+    "invalidate_responses",
     "is_reset_token_used",
+    "materialize_occurrences",
     "read_accounts",
     "read_activities",
     "read_businesses",
@@ -70,6 +124,10 @@ __all__ = [
     "read_files",
     "read_tags",
     "read_tickets",
+    "refresh_autocomplete_terms",
+    "refresh_search_vectors",
+    "response_key",
+    "shift_periodic_events",
     "update_account",
     "update_activity",
     "update_business",
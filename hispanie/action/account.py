@@ -7,10 +7,19 @@ from itsdangerous import URLSafeTimedSerializer
 from jose import JWTError, jwt
 from pydantic import SecretStr
 
+from ..cache import TTLCache
 from ..config import Config, logging
-from ..model import Account, AccountType, File, ResetToken
-from ..schema import AccountCreateRequest, AccountUpdateRequest
-from ..utils import OAuth2PasswordBearerWithCookie, check_password_hash, handle_update_files
+from ..db import transaction, unit_of_work
+from ..model import Account, AccountType, File, ResetToken, load_options
+from ..notify import ALL, publish, register_handler
+from ..password import acheck_password, ahash_password, needs_rehash
+from ..schema import (
+    AccountCreateRequest,
+    AccountPrincipal,
+    AccountResponse,
+    AccountUpdateRequest,
+)
+from ..utils import OAuth2PasswordBearerWithCookie, handle_update_files
 
 logger = logging.getLogger(__name__)
 
@@ -39,17 +48,26 @@ CREDENTIAL_EXCEPTION = HTTPException(
 
 oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/api/v1/accounts/public/login")
 
+ACCOUNT_LOADERS = load_options(Account, AccountResponse)
+
+# Authenticated accounts keyed by (token subject, token expiration)
+principal_cache: TTLCache[tuple[str, int], AccountPrincipal] = TTLCache(
+    maxsize=int(Config.jwt.principal_cache_size),
+    ttl=int(Config.jwt.principal_cache_ttl),
+    name="principal",
+)
+
 
 # create account
 
 
-def create(account_data: AccountCreateRequest) -> Account:
+async def create(account_data: AccountCreateRequest) -> Account:
     logger.info("Adding new account")
     account = Account(
         username=account_data.username,
         email=account_data.email,
         type=AccountType(account_data.type),
-        password=account_data.password,
+        _password=await ahash_password(account_data.password),
     ).create()
     logger.info("Added new account %s", account.id)
     return account
@@ -72,18 +90,40 @@ def read(account_id: str | None = None, **kwargs) -> Account | list[Account]:
         return accounts
 
 
+@overload
+async def aread(account_id: str) -> Account: ...
+@overload
+async def aread(**kwargs) -> list[Account]: ...
+async def aread(account_id: str | None = None, **kwargs) -> Account | list[Account]:
+    if account_id:
+        logger.info("Reading account: %s", account_id)
+        account = await Account.aget(id=account_id, options=ACCOUNT_LOADERS)
+        logger.info("Data found for account %s", account.id)
+        return account
+    else:
+        logger.info("Reading all accounts with filters %s", kwargs)
+        accounts = await Account.afind(options=ACCOUNT_LOADERS, **kwargs)
+        logger.info("Data found for account %s", [ac.id for ac in accounts])
+        return accounts
+
+
 # update account
 
 
-def update(account_id: str, account_data: AccountUpdateRequest) -> Account:
+async def update(account_id: str, account_data: AccountUpdateRequest) -> Account:
     logger.info("Updating %s with data %s", account_id, account_data)
     account = Account.get(id=account_id)
     data = account_data.model_dump(exclude_none=True)
-    if files := data.pop("files", []):
-        data["files"] = handle_update_files(files, File)
+    files = data.pop("files", [])
     if old_password := data.pop("old_password", ""):
-        authenticate_account(account.username, old_password)
-    result = account.update(**data)
+        await authenticate_account(account.username, old_password)
+    if password := data.pop("password", ""):
+        data["_password"] = await ahash_password(password)
+    with transaction():
+        if files:
+            data["files"] = handle_update_files(files, File, account_id=account_id)
+        result = account.update(**data)
+        publish("account", account_id)
     logger.info("Updated account %s", account_id)
     return result
 
@@ -93,7 +133,9 @@ def update(account_id: str, account_data: AccountUpdateRequest) -> Account:
 
 def delete(account_id: str) -> Account:
     logger.info("Deleting %s account", account_id)
-    result = Account.get(id=account_id).delete()
+    with transaction():
+        result = Account.get(id=account_id).delete()
+        publish("account", account_id)
     logger.info("Deleted account %s", account_id)
     return result
 
@@ -101,11 +143,16 @@ def delete(account_id: str) -> Account:
 # authenticate account
 
 
-def authenticate_account(username: str, password: str) -> Account | None:
-    accounts = read(username=username)
-    if accounts and check_password_hash(accounts[0].password, password):
-        return accounts[0]
-    return None
+async def authenticate_account(username: str, password: str) -> Account | None:
+    accounts = await Account.afind(username=username)
+    if not accounts or not await acheck_password(accounts[0].password, password):
+        return None
+
+    account = accounts[0]
+    if needs_rehash(account.password):
+        logger.info("Rehashing password of account %s with the configured cost", account.id)
+        await account.aupdate(_password=await ahash_password(password))
+    return account
 
 
 # create account access token
@@ -124,23 +171,49 @@ def generate_expiration_time(delta: int) -> datetime:
 # get account for authentification
 
 
-async def check_account_session(token: str = Depends(oauth2_scheme)) -> str:
+def decode_access_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, Config.jwt.secret_key, algorithms=[Config.jwt.algorithm])
     except JWTError:
         raise CREDENTIAL_EXCEPTION
 
-    if not (username := payload.get("sub")):
+    if not payload.get("sub"):
         raise CREDENTIAL_EXCEPTION
 
-    return username
+    return payload
 
 
-async def get_current_account(token: str = Depends(oauth2_scheme)) -> Account:
-    accounts = read(username=await check_account_session(token))
+async def check_account_session(token: str = Depends(oauth2_scheme)) -> str:
+    return decode_access_token(token)["sub"]
+
+
+async def get_current_account(token: str = Depends(oauth2_scheme)) -> AccountPrincipal:
+    payload = decode_access_token(token)
+    key = (payload["sub"], payload["exp"])
+    if principal := principal_cache.get(key):
+        return principal
+
+    accounts = await Account.afind(username=payload["sub"])
     if not accounts:
         raise CREDENTIAL_EXCEPTION
-    return accounts[0]
+
+    principal = AccountPrincipal.model_validate(accounts[0])
+    # Never keep a principal longer than its token
+    ttl = min(principal_cache.ttl, payload["exp"] - datetime.now(timezone.utc).timestamp())
+    principal_cache.set(key, principal, ttl=ttl)
+    return principal
+
+
+def invalidate_principal(account_id: str) -> None:
+    if account_id == ALL:
+        principal_cache.clear()
+        logger.info("Evicted every cached principal")
+        return
+    evicted = principal_cache.evict(lambda _, principal: principal.id == account_id)
+    logger.info("Evicted %s cached principals of account %s", evicted, account_id)
+
+
+register_handler("account", invalidate_principal)
 
 
 # handle password forgotten
@@ -158,7 +231,7 @@ def handle_forgotten_password(email: str, background_tasks: BackgroundTasks) ->
     logger.info("Preparing email for account %s to email %s", account.id, account.email)
 
 
-def handle_reset_password(token: str, new_password: str) -> None:
+async def handle_reset_password(token: str, new_password: str) -> None:
     logger.info("Reseting password")
 
     is_used = is_reset_token_used(token)
@@ -173,7 +246,7 @@ def handle_reset_password(token: str, new_password: str) -> None:
     if not accounts:
         raise HTTPException(status_code=404, detail="account not found")
 
-    result = accounts[0].update(password=new_password)
+    result = accounts[0].update(_password=await ahash_password(new_password))
     logger.info("Reseted password for account %s", result.id)
     set_reset_token_as_used(token)
 
@@ -190,7 +263,9 @@ async def send_reset_email(account: Account, token: str) -> None:
     fm = FastMail(EMAIL_CONFIG)
     await fm.send_message(message)
     logger.info("Email sent to %s", account.email)
-    save_reset_token(account, token)
+    # Background tasks run once the request unit of work is closed
+    with unit_of_work():
+        save_reset_token(read(account.id), token)
 
 
 def save_reset_token(account: Account, token: str) -> None:
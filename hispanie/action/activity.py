@@ -1,11 +1,15 @@
 from typing import overload
 
 from ..config import logging
-from ..model import Activity, Event
-from ..schema import ActivityCreateRequest, ActivityUpdateRequest
+from ..db import transaction
+from ..model import Activity, Event, load_options
+from ..notify import publish
+from ..schema import ActivityCreateRequest, ActivityResponse, ActivityUpdateRequest
 
 logger = logging.getLogger(__name__)
 
+ACTIVITY_LOADERS = load_options(Activity, ActivityResponse)
+
 
 def create(activity_data: ActivityCreateRequest) -> Activity:
     # Check event
@@ -16,7 +20,10 @@ def create(activity_data: ActivityCreateRequest) -> Activity:
         return activities[0]
 
     logger.info("Adding new activity: %s", activity_data)
-    activity = Activity(**activity_data.model_dump()).create()
+    with transaction():
+        activity = Activity(**activity_data.model_dump()).create()
+        Event.touch(Event.id == activity.event_id)
+        publish("activity", activity.id)
     logger.info("Added new activity: %s", activity.id)
     return activity
 
@@ -34,17 +41,41 @@ def read(activity_id: str | None = None, **kwargs) -> Activity | list[Activity]:
         return Activity.find(**kwargs)
 
 
+@overload
+async def aread(activity_id: str) -> Activity: ...
+@overload
+async def aread(**kwargs) -> list[Activity]: ...
+async def aread(activity_id: str | None = None, **kwargs) -> Activity | list[Activity]:
+    if activity_id:
+        logger.info("Reading activity: %s", activity_id)
+        return await Activity.aget(id=activity_id, options=ACTIVITY_LOADERS)
+    else:
+        logger.info("Reading all activities with filters %s", kwargs)
+        return await Activity.afind(options=ACTIVITY_LOADERS, **kwargs)
+
+
+async def apaginate(
+    limit: int, cursor: str | None = None, **kwargs
+) -> tuple[list[Activity], str | None]:
+    logger.info("Reading activities page with filters %s", kwargs)
+    return await Activity.apaginate(limit, cursor, options=ACTIVITY_LOADERS, **kwargs)
+
+
 def update(activity_id: str, activity_data: ActivityUpdateRequest) -> Activity:
     logger.info("Updating activity: %s with %s", activity_id, activity_data)
-    tag = Activity.get(id=activity_id)
-    result = tag.update(**activity_data.model_dump(exclude_none=True))
+    with transaction():
+        result = Activity.get(id=activity_id).update(**activity_data.model_dump(exclude_none=True))
+        Event.touch(Event.id == result.event_id)
+        publish("activity", activity_id)
     logger.info("Updated activity: %s", activity_id)
     return result
 
 
 def delete(activity_id: str) -> Activity:
     logger.info("Deleting activity: %s", activity_id)
-    activity = Activity.get(id=activity_id)
-    result = activity.delete()
+    with transaction():
+        result = Activity.get(id=activity_id).delete()
+        Event.touch(Event.id == result.event_id)
+        publish("activity", activity_id)
     logger.info("Deleted activity: %s", activity_id)
     return result
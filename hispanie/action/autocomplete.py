@@ -0,0 +1,51 @@
+from typing import Any, Literal
+
+from sqlalchemy import func, or_, select, text
+
+from ..config import logging
+from ..db import async_session_scope, session_scope
+from ..model import Event, autocomplete_term
+
+logger = logging.getLogger(__name__)
+
+AutocompleteKind = Literal["tag", "city", "event"]
+
+
+async def aautocomplete(kind: AutocompleteKind, q: str, limit: int) -> list[dict[str, Any]]:
+    """Return the `limit` best suggestions of `kind` for the typed text `q`.
+
+    Prefix and trigram similarity matches are both served by the trigram GIN indexes. Tags
+    and cities come from the autocomplete_term view, most popular first, events from the
+    upcoming ones, closest match and soonest first.
+    """
+    logger.info("Autocompleting %s %s", kind, q)
+    if kind == "event":
+        query = (
+            select(Event.name.label("value"), Event.id.label("id"))
+            .where(
+                or_(Event.name.istartswith(q, autoescape=True), Event.name.bool_op("%")(q)),
+                Event.end_date >= func.now(),
+            )
+            .order_by(func.similarity(Event.name, q).desc(), Event.start_date)
+            .limit(limit)
+        )
+    else:
+        term = autocomplete_term.c
+        query = (
+            select(term.term.label("value"), term.ref_id.label("id"), term.popularity)
+            .where(
+                term.kind == kind,
+                or_(term.term.istartswith(q, autoescape=True), term.term.bool_op("%")(q)),
+            )
+            .order_by(term.popularity.desc(), func.similarity(term.term, q).desc())
+            .limit(limit)
+        )
+    async with async_session_scope() as session:
+        return [row._asdict() for row in await session.execute(query)]
+
+
+def refresh_autocomplete_terms() -> None:
+    """Recompute the tag and city suggestions without blocking the readers of the view."""
+    logger.info("Refreshing autocomplete terms")
+    with session_scope() as session:
+        session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY autocomplete_term"))
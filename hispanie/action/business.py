@@ -1,31 +1,47 @@
+from datetime import datetime
 from typing import overload
 
+from sqlalchemy import func
+from sqlalchemy.orm.attributes import set_committed_value
+
 from ..config import logging
-from ..model import Business, File, SocialNetwork
-from ..schema import BusinessCreateRequest, BusinessUpdateRequest
-from ..utils import ensure_user_owns_resource, handle_update_files, handle_update_resources
+from ..db import transaction
+from ..errors import NoBusinessFound
+from ..model import Business, File, SocialNetwork, load_options
+from ..notify import publish
+from ..schema import BusinessCreateRequest, BusinessResponse, BusinessUpdateRequest
+from ..utils import handle_update_files, handle_update_resources
 from .account import read as read_accounts
+from .search import refresh_search_vectors
 from .tag import read as read_tags
 
 logger = logging.getLogger(__name__)
 
+BUSINESS_LOADERS = load_options(Business, BusinessResponse)
+
+# Collections of the update requests, applied after the columns UPDATE
+BUSINESS_RELATIONSHIPS = ("files", "social_networks", "tags")
+
 
 def create(business_data: BusinessCreateRequest, account_id: str) -> Business:
-    account = read_accounts(account_id)
-    data = business_data.model_dump()
-    logger.info("Adding new business: %s", data)
-    # Format and check extra models
-    social_networks = [SocialNetwork(**sn) for sn in data.pop("social_networks")]
-    files = [File(**file).create() for file in data.pop("files")]
-    tags = read_tags(id=[t["id"] for t in data.pop("tags")])
-    business = Business(
-        account=account,
-        files=files,
-        social_networks=social_networks,
-        tags=tags,
-        **data,
-    ).create()
-    logger.info("Added new business %s", business.id)
+    with transaction():
+        account = read_accounts(account_id)
+        data = business_data.model_dump()
+        logger.info("Adding new business: %s", data)
+        social_networks = data.pop("social_networks")
+        files = data.pop("files")
+        tags = read_tags(id=[t["id"] for t in data.pop("tags")])
+        business = Business(account=account, tags=tags, **data).create()
+        # The children are inserted with one statement per model, the business flushed first
+        for name, model, rows in (
+            ("files", File, files),
+            ("social_networks", SocialNetwork, social_networks),
+        ):
+            children = model.bulk_create({**row, "business_id": business.id} for row in rows)
+            set_committed_value(business, name, children)
+        refresh_search_vectors("business", Business.id == business.id)
+        logger.info("Added new business %s", business.id)
+        publish("business", business.id)
     return business
 
 
@@ -42,29 +58,81 @@ def read(business_id: str | None = None, **kwargs) -> Business | list[Business]:
         return Business.find(**kwargs)
 
 
-def update(business_id: str, account_id: str, business_data: BusinessUpdateRequest) -> Business:
-    business = Business.get(id=business_id)
-    ensure_user_owns_resource(account_id, business.account_id)
-    data = business_data.model_dump(exclude_none=True)
-    logger.info("Updating business: %s with %s", business_id, data)
-    # Format and check tags
-    if tags := data.pop("tags", []):
-        data["tags"] = read_tags(id=[t["id"] for t in tags])
-    if files := data.pop("files", []):
-        data["files"] = handle_update_files(files, File)
-    if social_networks := data.pop("social_networks", []):
-        data["social_networks"] = handle_update_resources(
-            social_networks, business.social_networks, SocialNetwork
+@overload
+async def aread(business_id: str, public: bool = False) -> Business: ...
+@overload
+async def aread(**kwargs) -> list[Business]: ...
+async def aread(
+    business_id: str | None = None, public: bool = False, **kwargs
+) -> Business | list[Business]:
+    if business_id:
+        logger.info("Reading business: %s", business_id)
+        result = await Business.aget(id=business_id, options=BUSINESS_LOADERS)
+        # A private business is not found by the public routes
+        if public and not result.is_public:
+            raise NoBusinessFound(id=business_id)
+        return result
+    else:
+        logger.info("Reading all business")
+        return await Business.afind(options=BUSINESS_LOADERS, **kwargs)
+
+
+async def apaginate(
+    limit: int, cursor: str | None = None, **kwargs
+) -> tuple[list[Business], str | None]:
+    logger.info("Reading businesses page with filters %s", kwargs)
+    return await Business.apaginate(limit, cursor, options=BUSINESS_LOADERS, **kwargs)
+
+
+async def aversion(**kwargs) -> tuple[datetime | None, int]:
+    """Return the (last change date, count) validator of the businesses matching the filters."""
+    return await Business.aversion(**kwargs)
+
+
+async def anearby(
+    latitude: float, longitude: float, radius: float, limit: int
+) -> list[tuple[Business, float]]:
+    logger.info("Reading businesses %sm around (%s, %s)", radius, latitude, longitude)
+    return await Business.anearby(latitude, longitude, radius, limit, options=BUSINESS_LOADERS)
+
+
+def update(
+    business_id: str,
+    account_id: str,
+    business_data: BusinessUpdateRequest,
+    is_admin: bool = False,
+) -> Business:
+    with transaction():
+        data = business_data.model_dump(exclude_none=True)
+        logger.info("Updating business: %s with %s", business_id, data)
+        columns = {key: value for key, value in data.items() if key not in BUSINESS_RELATIONSHIPS}
+        business = Business.update_owned(
+            business_id, account_id, bypass=is_admin, update_date=func.now(), **columns
         )
-    result = business.update(**data)
-    logger.info("Updated business: %s", business_id)
+        data = {key: value for key, value in data.items() if key in BUSINESS_RELATIONSHIPS}
+        # Format and check tags
+        if tags := data.pop("tags", []):
+            data["tags"] = read_tags(id=[t["id"] for t in tags])
+        if files := data.pop("files", []):
+            data["files"] = handle_update_files(files, File, business_id=business_id)
+        if social_networks := data.pop("social_networks", []):
+            data["social_networks"] = handle_update_resources(
+                social_networks, business.social_networks, SocialNetwork, business_id=business_id
+            )
+        result = business.update(**data) if data else business
+        if (columns.keys() | data.keys()) & {"name", "tags", "description", "city"}:
+            refresh_search_vectors("business", Business.id == business_id)
+        logger.info("Updated business: %s", business_id)
+        publish("business", business_id)
     return result
 
 
-def delete(event_id: str, account_id: str) -> Business:
-    logger.info("Deleting business: %s", event_id)
-    business = Business.get(id=event_id)
-    ensure_user_owns_resource(account_id, business.account_id)
-    result = business.delete()
-    logger.info("Deleted business: %s", event_id)
+def delete(business_id: str, account_id: str, is_admin: bool = False) -> Business:
+    logger.info("Deleting business: %s", business_id)
+    with transaction():
+        # The response holds the children, load them before the cascade deletes them
+        result = Business.get(id=business_id, options=BUSINESS_LOADERS)
+        Business.delete_owned(business_id, account_id, bypass=is_admin)
+        publish("business", business_id)
+    logger.info("Deleted business: %s", business_id)
     return result
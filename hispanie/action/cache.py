@@ -0,0 +1,133 @@
+import json
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from pydantic import BaseModel
+
+from ..cache import SingleFlight, TTLCache
+from ..config import Config, logging
+from ..db import async_unit_of_work
+from ..notify import register_handler
+from .serialize import entity_json, page_json
+
+logger = logging.getLogger(__name__)
+
+# Serialized public read responses keyed by (endpoint, normalized parameters)
+response_cache: TTLCache[tuple[str, str], bytes] = TTLCache(
+    maxsize=int(Config.cache.response_size),
+    ttl=int(Config.cache.response_ttl),
+    name="responses",
+    maxbytes=int(Config.cache.response_bytes),
+    sizeof=len,
+)
+
+# Validators of the cached responses, cleared with them
+version_cache: TTLCache[tuple[str, str], tuple[datetime | None, int]] = TTLCache(
+    maxsize=int(Config.cache.response_size),
+    ttl=int(Config.cache.response_ttl),
+    name="versions",
+)
+
+# Concurrent identical misses of each cache, run once per worker
+response_flights: SingleFlight[tuple[int, str, str], bytes] = SingleFlight(name="responses")
+version_flights: SingleFlight[tuple[int, str, str], tuple[datetime | None, int]] = SingleFlight(
+    name="versions"
+)
+
+# Entities embedded in the cached responses
+CATALOGUE_ENTITIES = ("activity", "business", "event", "file", "tag", "ticket")
+
+# Incremented by every invalidation, a response read before it is not cached after it
+_generation = 0
+
+
+def response_key(endpoint: str, params: dict[str, Any]) -> tuple[str, str]:
+    """Return the cache key of `endpoint` called with `params`, whatever their order."""
+    normalized = {
+        key: sorted(value, key=str) if isinstance(value, list) else value
+        for key, value in params.items()
+        if value is not None
+    }
+    return endpoint, json.dumps(normalized, sort_keys=True, default=str)
+
+
+async def _acached(
+    cache: TTLCache[tuple[str, str], Any],
+    flights: SingleFlight[tuple[int, str, str], Any],
+    key: tuple[str, str],
+    produce: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Return the value of `key` from `cache`, the concurrent misses sharing one `produce`."""
+    if (value := cache.get(key)) is not None:
+        return value
+    generation = _generation
+
+    async def produce_and_cache() -> Any:
+        # Shared by several requests, it does not use the session of the first one
+        async with async_unit_of_work():
+            value = await produce()
+        if generation == _generation:
+            cache.set(key, value)
+        return value
+
+    # Misses after an invalidation do not join a flight started before it
+    return await flights.do((generation, *key), produce_and_cache)
+
+
+async def acached_page(
+    endpoint: str,
+    params: dict[str, Any],
+    item_model: type[BaseModel],
+    produce: Callable[[], Awaitable[tuple[list[Any], str | None]]],
+) -> bytes:
+    """Return the JSON page of `endpoint` from the cache, or `produce` and cache it."""
+
+    async def serialize() -> bytes:
+        items, next_cursor = await produce()
+        return page_json(item_model, items, next_cursor)
+
+    return await _acached(
+        response_cache, response_flights, response_key(endpoint, params), serialize
+    )
+
+
+async def acached_item(
+    endpoint: str,
+    params: dict[str, Any],
+    model: type[BaseModel],
+    produce: Callable[[], Awaitable[Any]],
+) -> bytes:
+    """Return the JSON of a single resource of `endpoint` from the cache, or `produce` it."""
+
+    async def serialize() -> bytes:
+        return entity_json(model, await produce())
+
+    return await _acached(
+        response_cache, response_flights, response_key(endpoint, params), serialize
+    )
+
+
+async def acached_version(
+    endpoint: str,
+    params: dict[str, Any],
+    produce: Callable[[], Awaitable[tuple[datetime | None, int]]],
+) -> tuple[datetime | None, int]:
+    """Return the (last change date, row count) validator of `endpoint` from the cache."""
+    return await _acached(version_cache, version_flights, response_key(endpoint, params), produce)
+
+
+def invalidate_responses(_id: str | None = None) -> None:
+    """Drop the cached responses, called on every change of the public catalogue.
+
+    Responses embed the tags, files, activities and tickets of their events and businesses,
+    any write may change any of them.
+    """
+    global _generation
+    _generation += 1
+    response_cache.clear()
+    version_cache.clear()
+    logger.info("Invalidated cached responses")
+
+
+for entity in CATALOGUE_ENTITIES:
+    register_handler(entity, invalidate_responses)
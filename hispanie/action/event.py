@@ -1,38 +1,79 @@
+from datetime import datetime, timedelta, timezone
 from typing import overload
 
-from ..config import logging
-from ..model import Activity, Event, File, Tag, Ticket
-from ..schema import EventCreateRequest, EventUpdateRequest
+from sqlalchemy import and_, func, select
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import update as sql_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..config import Config, logging
+from ..db import session_scope, transaction
+from ..errors import NoEventFound
+from ..model import (
+    Activity,
+    Event,
+    EventFrequency,
+    EventOccurrence,
+    File,
+    Tag,
+    Ticket,
+    load_options,
+)
+from ..notify import publish
+from ..schema import (
+    EventCreateRequest,
+    EventOccurrenceResponse,
+    EventResponse,
+    EventUpdateRequest,
+)
 from ..utils import (
     delete_duplicates,
-    ensure_user_owns_resource,
     handle_update_files,
     handle_update_resources,
 )
 from .account import read as read_accounts
+from .search import refresh_search_vectors
 from .tag import read as read_tags
 
 logger = logging.getLogger(__name__)
 
+EVENT_LOADERS = load_options(Event, EventResponse)
+OCCURRENCE_LOADERS = load_options(EventOccurrence, EventOccurrenceResponse)
+
+# Collections of the update requests, applied after the columns UPDATE
+EVENT_RELATIONSHIPS = ("activities", "files", "tags", "tickets")
+
+FREQUENCY_INTERVALS = {
+    EventFrequency.DAILY: timedelta(days=1),
+    EventFrequency.WEEKLY: timedelta(weeks=1),
+    EventFrequency.MONTHLY: timedelta(weeks=4),
+}
+
 
 def create(event_data: EventCreateRequest, account_id: str) -> Event:
-    account = read_accounts(account_id)
-    data = event_data.model_dump()
-    logger.info("Adding new event: %s", data)
-    # Format and check extra models
-    activities = [Activity(**act) for act in delete_duplicates(data.pop("activities"), "name")]
-    files = [File(**file).create() for file in data.pop("files")]
-    tags = read_tags(id=[tag["id"] for tag in data.pop("tags")])
-    tickets = [Ticket(**tic) for tic in delete_duplicates(data.pop("tickets"), "name")]
-    event = Event(
-        account=account,
-        activities=activities,
-        files=files,
-        tags=tags,
-        tickets=tickets,
-        **data,
-    ).create()
-    logger.info("Added new event: %s", event.id)
+    # One transaction for the whole aggregate, the nested scopes only flush
+    with transaction():
+        account = read_accounts(account_id)
+        data = event_data.model_dump()
+        logger.info("Adding new event: %s", data)
+        activities = delete_duplicates(data.pop("activities"), "name")
+        files = data.pop("files")
+        tags = read_tags(id=[tag["id"] for tag in data.pop("tags")])
+        tickets = delete_duplicates(data.pop("tickets"), "name")
+        event = Event(account=account, tags=tags, **data).create()
+        # The children are inserted with one statement per model, the event flushed first
+        for name, model, rows in (
+            ("activities", Activity, activities),
+            ("files", File, files),
+            ("tickets", Ticket, tickets),
+        ):
+            children = model.bulk_create({**row, "event_id": event.id} for row in rows)
+            set_committed_value(event, name, children)
+        materialize_occurrences([event.id])
+        refresh_search_vectors("event", Event.id == event.id)
+        logger.info("Added new event: %s", event.id)
+        publish("event", event.id)
     return event
 
 
@@ -49,40 +90,192 @@ def read(event_id: str | None = None, **kwargs) -> Event | list[Event]:
         return Event.find(**kwargs)
 
 
-def update(event_id: str, account_id: str, event_data: EventUpdateRequest) -> Event:
-    event = Event.get(id=event_id)
-    ensure_user_owns_resource(account_id, event.account_id)
-    data = event_data.model_dump(exclude_none=True)
-    logger.info("Updating event: %s with %s", event_id, data)
-    # Format and check tags
-    if activities := data.pop("activities", []):
-        data["activities"] = handle_update_resources(
-            activities,
-            event.activities,
-            Activity,
-            remove_duplicates=True,
-        )
-    if files := data.pop("files", []):
-        data["files"] = handle_update_files(files, File)
-    if tags := data.pop("tags", []):
-        data["tags"] = [Tag.get(id=t["id"]) for t in tags]
-    if tickets := data.pop("tickets", []):
-        data["tickets"] = handle_update_resources(
-            tickets,
-            event.tickets,
-            Ticket,
-            remove_duplicates=True,
+@overload
+async def aread(event_id: str, public: bool = False) -> Event: ...
+@overload
+async def aread(**kwargs) -> list[Event]: ...
+async def aread(event_id: str | None = None, public: bool = False, **kwargs) -> Event | list[Event]:
+    if event_id:
+        logger.info("Reading event: %s", event_id)
+        result = await Event.aget(id=event_id, options=EVENT_LOADERS)
+        # A private event is not found by the public routes
+        if public and not result.is_public:
+            raise NoEventFound(id=event_id)
+        return result
+    else:
+        logger.info("Reading all events")
+        return await Event.afind(options=EVENT_LOADERS, **kwargs)
+
+
+async def apaginate(
+    limit: int, cursor: str | None = None, **kwargs
+) -> tuple[list[Event], str | None]:
+    logger.info("Reading events page with filters %s", kwargs)
+    return await Event.apaginate(limit, cursor, options=EVENT_LOADERS, **kwargs)
+
+
+async def aversion(**kwargs) -> tuple[datetime | None, int]:
+    """Return the (last change date, count) validator of the events matching the filters."""
+    return await Event.aversion(**kwargs)
+
+
+def update(
+    event_id: str, account_id: str, event_data: EventUpdateRequest, is_admin: bool = False
+) -> Event:
+    with transaction():
+        data = event_data.model_dump(exclude_none=True)
+        logger.info("Updating event: %s with %s", event_id, data)
+        columns = {key: value for key, value in data.items() if key not in EVENT_RELATIONSHIPS}
+        event = Event.update_owned(
+            event_id, account_id, bypass=is_admin, update_date=func.now(), **columns
         )
-    result = event.update(**data)
-    logger.info("Updated event: %s", event_id)
+        data = {key: value for key, value in data.items() if key in EVENT_RELATIONSHIPS}
+        # Format and check extra models
+        if activities := data.pop("activities", []):
+            data["activities"] = handle_update_resources(
+                activities,
+                event.activities,
+                Activity,
+                remove_duplicates=True,
+                event_id=event_id,
+            )
+        if files := data.pop("files", []):
+            data["files"] = handle_update_files(files, File, event_id=event_id)
+        if tags := data.pop("tags", []):
+            data["tags"] = Tag.get_many(t["id"] for t in tags)
+        if tickets := data.pop("tickets", []):
+            data["tickets"] = handle_update_resources(
+                tickets,
+                event.tickets,
+                Ticket,
+                remove_duplicates=True,
+                event_id=event_id,
+            )
+        result = event.update(**data) if data else event
+        if columns.keys() & {"start_date", "end_date", "frequency"}:
+            materialize_occurrences([event_id])
+        if (columns.keys() | data.keys()) & {"name", "tags", "description", "city"}:
+            refresh_search_vectors("event", Event.id == event_id)
+        logger.info("Updated event: %s", event_id)
+        publish("event", event_id)
     return result
 
 
-def delete(event_id: str, account_id: str) -> Event:
+async def anearby(
+    latitude: float, longitude: float, radius: float, limit: int
+) -> list[tuple[Event, float]]:
+    logger.info("Reading events %sm around (%s, %s)", radius, latitude, longitude)
+    return await Event.anearby(latitude, longitude, radius, limit, options=EVENT_LOADERS)
+
+
+async def apaginate_occurrences(
+    start: datetime, end: datetime, limit: int, cursor: str | None = None
+) -> tuple[list[EventOccurrence], str | None]:
+    """Return the page of the event occurrences starting in [start, end)."""
+    logger.info("Reading event occurrences from %s to %s", start, end)
+    return await EventOccurrence.apaginate(
+        limit,
+        cursor,
+        options=OCCURRENCE_LOADERS,
+        where=[EventOccurrence.start_date >= start, EventOccurrence.start_date < end],
+    )
+
+
+def delete(event_id: str, account_id: str, is_admin: bool = False) -> Event:
     logger.info("Deleting event: %s", event_id)
-    event = Event.get(id=event_id)
-    # TODO add adming account can delete whateve it wants
-    ensure_user_owns_resource(account_id, event.account_id)
-    result = event.delete()
+    with transaction():
+        # The response holds the children, load them before the cascade deletes them
+        result = Event.get(id=event_id, options=EVENT_LOADERS)
+        Event.delete_owned(event_id, account_id, bypass=is_admin)
+        publish("event", event_id)
     logger.info("Deleted event: %s", event_id)
     return result
+
+
+def shift_periodic_events() -> dict[str, dict[str, int]]:
+    """Move finished recurring events and their activities to their next occurrence.
+
+    Runs two set-based UPDATE statements per frequency in a single transaction and returns the
+    number of shifted rows per frequency.
+    """
+    logger.info("Shifting periodic events")
+    now = datetime.now(timezone.utc)
+    summary = {}
+    with transaction() as session:
+        for frequency, interval in FREQUENCY_INTERVALS.items():
+            finished = and_(Event.frequency == frequency, Event.end_date <= now)
+            # Activities first, their filter depends on the dates of the event
+            activities = session.execute(
+                sql_update(Activity)
+                .where(Activity.event_id == Event.id, finished)
+                .values(
+                    start_date=Activity.start_date + interval,
+                    end_date=Activity.end_date + interval,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            events = session.execute(
+                sql_update(Event)
+                .where(finished)
+                .values(start_date=Event.start_date + interval, end_date=Event.end_date + interval)
+                .execution_options(synchronize_session=False)
+            )
+            summary[frequency.value] = {
+                "events": events.rowcount,
+                "activities": activities.rowcount,
+            }
+        publish("event")
+    logger.info("Shifted periodic events: %s", summary)
+    return summary
+
+
+def materialize_occurrences(event_ids: list[str] | None = None) -> int:
+    """Insert the occurrences of the events up to the calendar horizon.
+
+    Without `event_ids`, as run by the scheduler, recurring events get the occurrences entering
+    the rolling horizon, the existing ones being left untouched. Otherwise the upcoming
+    occurrences of the given events are regenerated from their current dates. Returns the number
+    of inserted rows.
+    """
+    now = datetime.now(timezone.utc)
+    until = now + timedelta(days=int(Config.calendar.horizon_days))
+    frequencies = list(EventFrequency) if event_ids is not None else list(FREQUENCY_INTERVALS)
+    logger.info("Materializing occurrences until %s of events %s", until, event_ids or "all")
+    inserted = 0
+    with session_scope() as session:
+        if event_ids is not None:
+            session.execute(
+                sql_delete(EventOccurrence).where(
+                    EventOccurrence.event_id.in_(event_ids), EventOccurrence.end_date > now
+                )
+            )
+        for frequency in frequencies:
+            if interval := FREQUENCY_INTERVALS.get(frequency):
+                starts = func.generate_series(
+                    Event.start_date, until, interval, type_=Event.start_date.type
+                )
+            else:
+                starts = Event.start_date
+            series = select(
+                Event.id.label("event_id"),
+                starts.label("start_date"),
+                (Event.end_date - Event.start_date).label("duration"),
+            ).where(Event.frequency == frequency)
+            if event_ids is not None:
+                series = series.where(Event.id.in_(event_ids))
+            series = series.subquery()
+            result = session.execute(
+                pg_insert(EventOccurrence)
+                .from_select(
+                    ["event_id", "start_date", "end_date"],
+                    select(
+                        series.c.event_id,
+                        series.c.start_date,
+                        series.c.start_date + series.c.duration,
+                    ),
+                )
+                .on_conflict_do_nothing()
+            )
+            inserted += result.rowcount
+    logger.info("Materialized %s event occurrences", inserted)
+    return inserted
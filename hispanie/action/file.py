@@ -1,15 +1,25 @@
+from datetime import datetime
 from typing import overload
 
 import boto3
+from sqlalchemy import func, or_
 
 from ..config import Config, logging
-from ..model import File
-from ..schema import FileCreateRequest, FileUpdateRequest
-from ..utils import ensure_user_owns_resource
+from ..db import transaction
+from ..model import Business, Event, File, load_options
+from ..notify import publish
+from ..schema import FileCreateRequest, FileResponse, FileUpdateRequest
 from .account import read as read_accounts
 
 logger = logging.getLogger(__name__)
 
+FILE_LOADERS = load_options(File, FileResponse)
+
+# A file is public when it belongs to a public event or a public business
+PUBLIC_FILE = or_(
+    File.event.has(Event.is_public.is_(True)), File.business.has(Business.is_public.is_(True))
+)
+
 s3_client = boto3.client(
     "s3",
     aws_access_key_id=Config.aws.access_key,
@@ -47,7 +57,10 @@ def generate_download_presigned_url(filename: str):
 def create(file_data: FileCreateRequest, account_id: str) -> File:
     logger.info("Adding new file %s", file_data)
     account = read_accounts(account_id)
-    file = File(account=account, **file_data.model_dump()).create()
+    with transaction():
+        file = File(account=account, **file_data.model_dump()).create()
+        touch_parents(file)
+        publish("file", file.id)
     logger.info("Added new file %s", file.id)
     return file
 
@@ -65,19 +78,66 @@ def read(file_id: str | None = None, **kwargs) -> File | list[File]:
         return File.find(**kwargs)
 
 
-def update(file_id: str, account_id: str, event_data: FileUpdateRequest) -> File:
+@overload
+async def aread(file_id: str) -> File: ...
+@overload
+async def aread(**kwargs) -> list[File]: ...
+async def aread(file_id: str | None = None, **kwargs) -> File | list[File]:
+    if file_id:
+        logger.info("Reading %s data", file_id)
+        return await File.aget(id=file_id, options=FILE_LOADERS)
+    else:
+        logger.info("Reading all data")
+        return await File.afind(options=FILE_LOADERS, **kwargs)
+
+
+async def apaginate(
+    limit: int, cursor: str | None = None, public: bool = False, **kwargs
+) -> tuple[list[File], str | None]:
+    logger.info("Reading files page with filters %s", kwargs)
+    if public:
+        kwargs["where"] = [PUBLIC_FILE]
+    return await File.apaginate(limit, cursor, options=FILE_LOADERS, **kwargs)
+
+
+async def aversion(public: bool = False, **kwargs) -> tuple[datetime | None, int]:
+    """Return the (last change date, count) validator of the files matching the filters."""
+    if public:
+        kwargs["where"] = [PUBLIC_FILE]
+    return await File.aversion(**kwargs)
+
+
+def update(
+    file_id: str, account_id: str, event_data: FileUpdateRequest, is_admin: bool = False
+) -> File:
     logger.info("Updating %s file", file_id)
-    file = File.get(id=file_id)
-    ensure_user_owns_resource(account_id, file.account_id)
-    result = file.update(**event_data.model_dump(exclude_none=True))
+    with transaction():
+        result = File.update_owned(
+            file_id,
+            account_id,
+            bypass=is_admin,
+            update_date=func.now(),
+            **event_data.model_dump(exclude_none=True),
+        )
+        touch_parents(result)
+        publish("file", file_id)
     logger.info("Updated file %s", file_id)
     return result
 
 
-def delete(file_id: str, account_id: str) -> File:
+def delete(file_id: str, account_id: str, is_admin: bool = False) -> File:
     logger.info("Deleting %s file", file_id)
-    file = File.get(id=file_id)
-    ensure_user_owns_resource(account_id, file.account_id)
-    result = file.delete()
+    with transaction():
+        result = File.delete_owned(file_id, account_id, bypass=is_admin)
+        touch_parents(result)
+        publish("file", file_id)
     logger.info("Deleted file %s", file_id)
     return result
+
+
+def touch_parents(file: File) -> None:
+    """Move the update date of the event and business embedding `file`."""
+    if file.event_id:
+        Event.touch(Event.id == file.event_id)
+    if file.business_id:
+        Business.touch(Business.id == file.business_id)
@@ -0,0 +1,88 @@
+from collections import Counter, defaultdict
+from typing import Any
+
+from sqlalchemy import String, cast, func, literal, select, union_all
+
+from ..config import logging
+from ..db import async_session_scope
+from ..model import Business, Event
+
+logger = logging.getLogger(__name__)
+
+# Grid cells along a 256px map tile, ie clusters about 32px apart on screen
+CELLS_PER_TILE = 8
+MAX_CLUSTERS = 1000
+TOP_CATEGORIES = 3
+
+
+def cell_size(bbox: tuple[float, float, float, float], zoom: int) -> float:
+    """Return the side in degrees of the grid cells, coarsened to keep at most MAX_CLUSTERS."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    size = 360 / (2**zoom * CELLS_PER_TILE)
+    while ((max_lon - min_lon) / size + 1) * ((max_lat - min_lat) / size + 1) > MAX_CLUSTERS:
+        size *= 2
+    return size
+
+
+async def acluster(bbox: tuple[float, float, float, float], zoom: int) -> list[dict[str, Any]]:
+    """Aggregate the events and businesses in `bbox` into the grid cells of `zoom`.
+
+    Points are filtered through the GiST index on point(longitude, latitude) and grouped per
+    cell and category in SQL, only the per cell merge of the categories is done here.
+    """
+    min_lon, min_lat, max_lon, max_lat = bbox
+    size = cell_size(bbox, zoom)
+    logger.info("Clustering map %s at zoom %s with cells of %s degrees", bbox, zoom, size)
+    area = func.box(func.point(min_lon, min_lat), func.point(max_lon, max_lat))
+    points = union_all(
+        *(
+            select(
+                literal(kind).label("kind"),
+                cast(model.category, String).label("category"),
+                model.latitude,
+                model.longitude,
+            ).where(func.point(model.longitude, model.latitude).op("<@")(area))
+            for kind, model in (("event", Event), ("business", Business))
+        )
+    ).subquery()
+    cell_x = func.floor(points.c.longitude / size).label("cell_x")
+    cell_y = func.floor(points.c.latitude / size).label("cell_y")
+    query = select(
+        cell_x,
+        cell_y,
+        points.c.kind,
+        points.c.category,
+        func.count().label("count"),
+        func.sum(points.c.latitude).label("latitude"),
+        func.sum(points.c.longitude).label("longitude"),
+    ).group_by(cell_x, cell_y, points.c.kind, points.c.category)
+    async with async_session_scope() as session:
+        rows = (await session.execute(query)).all()
+
+    cells: dict[tuple[float, float], dict[str, Any]] = defaultdict(
+        lambda: {"count": 0, "latitude": 0.0, "longitude": 0.0, "kinds": Counter()}
+    )
+    categories: dict[tuple[float, float], Counter[str]] = defaultdict(Counter)
+    for row in rows:
+        cell = cells[row.cell_x, row.cell_y]
+        cell["count"] += row.count
+        cell["latitude"] += row.latitude
+        cell["longitude"] += row.longitude
+        cell["kinds"][row.kind] += row.count
+        # Enum names are stored, the API exposes their lower case values
+        categories[row.cell_x, row.cell_y][row.category.lower()] += row.count
+
+    return [
+        {
+            "latitude": cell["latitude"] / cell["count"],
+            "longitude": cell["longitude"] / cell["count"],
+            "count": cell["count"],
+            "events": cell["kinds"]["event"],
+            "businesses": cell["kinds"]["business"],
+            "top_categories": [
+                {"category": category, "count": count}
+                for category, count in categories[key].most_common(TOP_CATEGORIES)
+            ],
+        }
+        for key, cell in cells.items()
+    ]
@@ -0,0 +1,147 @@
+from typing import Any, Literal
+
+from sqlalchemy import ColumnElement, and_, func, literal, or_, select, tuple_, union_all
+from sqlalchemy import update as sql_update
+from sqlalchemy.dialects.postgresql import TSQUERY, TSVECTOR
+
+from ..config import Config, logging
+from ..db import async_session_scope, session_scope, unit_of_work
+from ..model import Business, BusinessTag, Event, EventTag, Tag, load_options
+from ..schema import BusinessResponse, EventResponse
+from ..utils import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+SearchKind = Literal["event", "business"]
+
+# Searchable models with their tag association column
+SEARCH_MODELS: dict[str, tuple[type[Event] | type[Business], Any]] = {
+    "event": (Event, EventTag.event_id),
+    "business": (Business, BusinessTag.business_id),
+}
+
+SEARCH_LOADERS = {
+    "event": load_options(Event, EventResponse),
+    "business": load_options(Business, BusinessResponse),
+}
+
+
+def search_languages() -> list[str]:
+    return [lang.strip() for lang in Config.search.languages.split(",") if lang.strip()]
+
+
+def search_document(kind: SearchKind) -> ColumnElement[Any]:
+    """Return the weighted tsvector of a row: name (A), tags (B), description (C), city (D).
+
+    Every text is stemmed with each configured language, a query in any of them matches.
+    """
+    model, tag_column = SEARCH_MODELS[kind]
+    tags = (
+        select(func.string_agg(Tag.name, " "))
+        .join_from(tag_column.class_, Tag)
+        .where(tag_column == model.id)
+        .scalar_subquery()
+    )
+    parts = ((model.name, "A"), (tags, "B"), (model.description, "C"), (model.city, "D"))
+    vectors = [
+        func.setweight(func.to_tsvector(lang, func.coalesce(text, "")), weight, type_=TSVECTOR)
+        for lang in search_languages()
+        for text, weight in parts
+    ]
+    document = vectors[0]
+    for vector in vectors[1:]:
+        document = document.op("||", return_type=TSVECTOR)(vector)
+    return document
+
+
+def search_query(q: str) -> ColumnElement[Any]:
+    queries = [func.websearch_to_tsquery(lang, q, type_=TSQUERY) for lang in search_languages()]
+    query = queries[0]
+    for other in queries[1:]:
+        query = query.op("||", return_type=TSQUERY)(other)
+    return query
+
+
+def refresh_search_vectors(kind: SearchKind, *where: ColumnElement[bool]) -> int:
+    """Recompute the search document of the rows matching `where` in a single UPDATE."""
+    model, _ = SEARCH_MODELS[kind]
+    with session_scope() as session:
+        result = session.execute(
+            sql_update(model)
+            .where(*where)
+            # Not a change of the resource, keep its update date
+            .values(search_vector=search_document(kind), update_date=model.update_date)
+            .execution_options(synchronize_session=False)
+        )
+    logger.info("Refreshed %s %s search vectors", result.rowcount, kind)
+    return result.rowcount
+
+
+def reindex_search_vectors() -> None:
+    """Recompute the search document of every row, after a change of `[search] languages`.
+
+    Installed as the `hispanie-reindex-search` command.
+    """
+    with unit_of_work():
+        for kind in SEARCH_MODELS:
+            refresh_search_vectors(kind)
+
+
+def refresh_tag_search_vectors(tag_id: str) -> None:
+    """Refresh the search documents of the events and businesses tagged with `tag_id`."""
+    refresh_search_vectors("event", Event.tags.any(Tag.id == tag_id))
+    refresh_search_vectors("business", Business.tags.any(Tag.id == tag_id))
+
+
+async def asearch(
+    q: str, limit: int, cursor: str | None = None, kind: SearchKind | None = None
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return a page of the events and businesses matching `q`, most relevant first.
+
+    The matching rows of both tables are found and ranked through their GIN index in one
+    query, the page is keyed by (rank, kind, id).
+    """
+    logger.info("Searching %s in %s", q, kind or "all")
+    query = search_query(q)
+    hits = union_all(
+        *(
+            select(
+                literal(name).label("kind"),
+                model.id.label("id"),
+                func.ts_rank(model.search_vector, query).label("rank"),
+            ).where(model.search_vector.bool_op("@@")(query))
+            for name, (model, _) in SEARCH_MODELS.items()
+            if kind in (None, name)
+        )
+    ).subquery()
+    statement = select(hits).order_by(hits.c.rank.desc(), hits.c.kind, hits.c.id)
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 3:
+            raise ValueError(f"Invalid cursor {cursor}")
+        rank, *key = values
+        statement = statement.where(
+            or_(
+                hits.c.rank < rank,
+                and_(hits.c.rank == rank, tuple_(hits.c.kind, hits.c.id) > tuple(key)),
+            )
+        )
+    async with async_session_scope() as session:
+        rows = (await session.execute(statement.limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].rank, rows[-1].kind, rows[-1].id])
+
+    entities: dict[tuple[str, str], Any] = {}
+    for name, (model, _) in SEARCH_MODELS.items():
+        if ids := [row.id for row in rows if row.kind == name]:
+            for entity in await model.afind(options=SEARCH_LOADERS[name], id=ids):
+                entities[name, entity.id] = entity
+    items = [
+        {"kind": row.kind, "rank": row.rank, row.kind: entities[row.kind, row.id]}
+        for row in rows
+        if (row.kind, row.id) in entities
+    ]
+    return items, next_cursor
@@ -0,0 +1,46 @@
+import json
+from datetime import datetime
+from typing import Any, Iterable
+
+from pydantic import BaseModel
+
+from ..cache import TTLCache
+from ..config import Config, logging
+
+logger = logging.getLogger(__name__)
+
+# JSON of the entities keyed by (schema, id, last change date), a changed row gets a new key
+entity_cache: TTLCache[tuple[str, str, datetime], bytes] = TTLCache(
+    maxsize=int(Config.cache.entity_size),
+    ttl=int(Config.cache.entity_ttl),
+    name="entities",
+    maxbytes=int(Config.cache.entity_bytes),
+    sizeof=len,
+)
+
+
+def entity_json(model: type[BaseModel], entity: Any) -> bytes:
+    """Return the JSON of `entity` as `model`, validated once per version of its row.
+
+    Writes to the children of an event or business move its update date, so the version also
+    covers the nested objects. Objects without a date are serialized every time.
+    """
+    version = getattr(entity, "update_date", None) or getattr(entity, "creation_date", None)
+    if version is None:
+        return model.model_validate(entity, from_attributes=True).model_dump_json().encode()
+    key = (model.__name__, entity.id, version)
+    if (content := entity_cache.get(key)) is None:
+        content = model.model_validate(entity, from_attributes=True).model_dump_json().encode()
+        entity_cache.set(key, content)
+    return content
+
+
+def page_json(model: type[BaseModel], items: Iterable[Any], next_cursor: str | None) -> bytes:
+    """Return the JSON of a `Page[model]`, concatenating the JSON of its items."""
+    return b"".join((
+        b'{"items":[',
+        b",".join(entity_json(model, item) for item in items),
+        b'],"next_cursor":',
+        json.dumps(next_cursor).encode(),
+        b"}",
+    ))
@@ -1,11 +1,17 @@
+from datetime import datetime
 from typing import overload
 
 from ..config import logging
-from ..model import Tag
-from ..schema import TagCreateRequest, TagUpdateRequest
+from ..db import transaction
+from ..model import Business, Event, Tag, load_options
+from ..notify import publish
+from ..schema import TagCreateRequest, TagResponse, TagUpdateRequest
+from .search import refresh_search_vectors, refresh_tag_search_vectors
 
 logger = logging.getLogger(__name__)
 
+TAG_LOADERS = load_options(Tag, TagResponse)
+
 
 def create(tag_data: TagCreateRequest) -> Tag:
     if tags := read(name=tag_data.name):
@@ -13,7 +19,9 @@ def create(tag_data: TagCreateRequest) -> Tag:
         return tags[0]
 
     logger.info("Adding new tag: %s", tag_data)
-    tag = Tag(**tag_data.model_dump()).create()
+    with transaction():
+        tag = Tag(**tag_data.model_dump()).create()
+        publish("tag", tag.id)
     logger.info("Added new tag: %s", tag.id)
     return tag
 
@@ -31,17 +39,57 @@ def read(tag_id: str | None = None, **kwargs) -> Tag | list[Tag]:
         return Tag.find(**kwargs)
 
 
+@overload
+async def aread(tag_id: str) -> Tag: ...
+@overload
+async def aread(**kwargs) -> list[Tag]: ...
+async def aread(tag_id: str | None = None, **kwargs) -> Tag | list[Tag]:
+    if tag_id:
+        logger.info("Reading tag: %s", tag_id)
+        return await Tag.aget(id=tag_id, options=TAG_LOADERS)
+    else:
+        logger.info("Reading all tags")
+        return await Tag.afind(options=TAG_LOADERS, **kwargs)
+
+
+async def apaginate(
+    limit: int, cursor: str | None = None, **kwargs
+) -> tuple[list[Tag], str | None]:
+    logger.info("Reading tags page with filters %s", kwargs)
+    return await Tag.apaginate(limit, cursor, options=TAG_LOADERS, **kwargs)
+
+
+async def aversion(**kwargs) -> tuple[datetime | None, int]:
+    """Return the (last change date, count) validator of the tags matching the filters."""
+    return await Tag.aversion(**kwargs)
+
+
 def update(tag_id: str, tag_data: TagUpdateRequest) -> Tag:
     logger.info("Updating tag: %s with %s", tag_id, tag_data)
-    tag = Tag.get(id=tag_id)
-    result = tag.update(**tag_data.model_dump(exclude_none=True))
+    with transaction():
+        tag = Tag.get(id=tag_id)
+        result = tag.update(**tag_data.model_dump(exclude_none=True))
+        if tag_data.name is not None:
+            refresh_tag_search_vectors(tag_id)
+        # Every field of the tag is embedded in the responses of its events and businesses
+        Event.touch(Event.tags.any(Tag.id == tag_id))
+        Business.touch(Business.tags.any(Tag.id == tag_id))
+        publish("tag", tag_id)
     logger.info("Updated tag: %s", tag_id)
     return result
 
 
 def delete(tag_id: str) -> Tag:
     logger.info("Deleting tag: %s", tag_id)
-    tag = Tag.get(id=tag_id)
-    result = tag.delete()
+    with transaction():
+        tag = Tag.get(id=tag_id)
+        event_ids = [event.id for event in tag.events]
+        business_ids = [business.id for business in tag.businesses]
+        result = tag.delete()
+        refresh_search_vectors("event", Event.id.in_(event_ids))
+        refresh_search_vectors("business", Business.id.in_(business_ids))
+        Event.touch(Event.id.in_(event_ids))
+        Business.touch(Business.id.in_(business_ids))
+        publish("tag", tag_id)
     logger.info("Deleted tag: %s", tag_id)
     return result
@@ -1,11 +1,15 @@
 from typing import overload
 
 from ..config import logging
-from ..model import Event, Ticket
-from ..schema import TicketCreateRequest, TicketUpdateRequest
+from ..db import transaction
+from ..model import Event, Ticket, load_options
+from ..notify import publish
+from ..schema import TicketCreateRequest, TicketResponse, TicketUpdateRequest
 
 logger = logging.getLogger(__name__)
 
+TICKET_LOADERS = load_options(Ticket, TicketResponse)
+
 
 def create(ticket_data: TicketCreateRequest) -> Ticket:
     # Check event
@@ -16,7 +20,10 @@ def create(ticket_data: TicketCreateRequest) -> Ticket:
         return activities[0]
 
     logger.info("Adding new ticket: %s", ticket_data)
-    ticket = Ticket(**ticket_data.model_dump()).create()
+    with transaction():
+        ticket = Ticket(**ticket_data.model_dump()).create()
+        Event.touch(Event.id == ticket.event_id)
+        publish("ticket", ticket.id)
     logger.info("Added new ticket: %s", ticket.id)
     return ticket
 
@@ -34,17 +41,41 @@ def read(ticket_id: str | None = None, **kwargs) -> Ticket | list[Ticket]:
         return Ticket.find(**kwargs)
 
 
+@overload
+async def aread(ticket_id: str) -> Ticket: ...
+@overload
+async def aread(**kwargs) -> list[Ticket]: ...
+async def aread(ticket_id: str | None = None, **kwargs) -> Ticket | list[Ticket]:
+    if ticket_id:
+        logger.info("Reading ticket: %s", ticket_id)
+        return await Ticket.aget(id=ticket_id, options=TICKET_LOADERS)
+    else:
+        logger.info("Reading all tickets with filters %s", kwargs)
+        return await Ticket.afind(options=TICKET_LOADERS, **kwargs)
+
+
+async def apaginate(
+    limit: int, cursor: str | None = None, **kwargs
+) -> tuple[list[Ticket], str | None]:
+    logger.info("Reading tickets page with filters %s", kwargs)
+    return await Ticket.apaginate(limit, cursor, options=TICKET_LOADERS, **kwargs)
+
+
 def update(ticket_id: str, ticket_data: TicketUpdateRequest) -> Ticket:
     logger.info("Updating ticket: %s with %s", ticket_id, ticket_data)
-    tag = Ticket.get(id=ticket_id)
-    result = tag.update(**ticket_data.model_dump(exclude_none=True))
+    with transaction():
+        result = Ticket.get(id=ticket_id).update(**ticket_data.model_dump(exclude_none=True))
+        Event.touch(Event.id == result.event_id)
+        publish("ticket", ticket_id)
     logger.info("Updated ticket: %s", ticket_id)
     return result
 
 
 def delete(ticket_id: str) -> Ticket:
     logger.info("Deleting ticket: %s", ticket_id)
-    activity = Ticket.get(id=ticket_id)
-    result = activity.delete()
+    with transaction():
+        result = Ticket.get(id=ticket_id).delete()
+        Event.touch(Event.id == result.event_id)
+        publish("ticket", ticket_id)
     logger.info("Deleted ticket: %s", ticket_id)
     return result
@@ -1,17 +1,28 @@
-from datetime import datetime, timedelta, timezone
+import asyncio
+from datetime import timedelta
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_utils.tasks import repeat_every
 
+from ..action import (
+    materialize_occurrences,
+    refresh_autocomplete_terms,
+    shift_periodic_events,
+)
 from ..config import Config, logging
-from ..db import initialize
-from ..model import Account, AccountType, Event, EventFrequency
+from ..db import initialize, request_session, unit_of_work
+from ..model import Account, AccountType
+from ..notify import run_listener
+from ..scheduler import register_job, run_scheduler
 from .routers.account import router as account_router
 from .routers.activity import router as activity_router
+from .routers.autocomplete import router as autocomplete_router
 from .routers.business import router as business_router
 from .routers.event import router as event_router
 from .routers.file import router as file_router
+from .routers.map import router as map_router
+from .routers.metrics import router as metrics_router
+from .routers.search import router as search_router
 from .routers.tag import router as tag_router
 from .routers.ticket import router as ticket_router
 
@@ -24,15 +35,9 @@ logger = logging.getLogger(__name__)
 
 API_PREFIX = "/api/v1"
 
-mapping_frequency_days = {
-    EventFrequency.DAILY: ("days", 1),
-    EventFrequency.WEEKLY: ("weeks", 1),
-    EventFrequency.MONTHLY: ("weeks", 4),
-}
-
 initialize(True)
 
-app = FastAPI()
+app = FastAPI(dependencies=[Depends(request_session)])
 
 # TODO Limit these to specific origins, methods, and headers to reduce the attack surface.
 # TODO If you set allow_credentials=True, you must carefully pair it with restrictive allow_origins settings to avoid exposing sensitive data to untrusted origins.
@@ -55,9 +60,13 @@ app.add_middleware(
 
 app.include_router(account_router, prefix=API_PREFIX)
 app.include_router(activity_router, prefix=API_PREFIX)
+app.include_router(autocomplete_router, prefix=API_PREFIX)
 app.include_router(business_router, prefix=API_PREFIX)
 app.include_router(event_router, prefix=API_PREFIX)
 app.include_router(file_router, prefix=API_PREFIX)
+app.include_router(map_router, prefix=API_PREFIX)
+app.include_router(metrics_router, prefix=API_PREFIX)
+app.include_router(search_router, prefix=API_PREFIX)
 app.include_router(tag_router, prefix=API_PREFIX)
 app.include_router(ticket_router, prefix=API_PREFIX)
 
@@ -66,44 +75,49 @@ app.include_router(ticket_router, prefix=API_PREFIX)
 async def startup_event():
     logger.info("Creating hispanie admin account")
 
-    account = Account.find(username=Config.account.username)
-    if account:
-        logger.info("Account %s already exists %s", Config.account.username, account[0].id)
-        return
-
-    account = Account(
-        username=Config.account.username,
-        password=Config.account.password,
-        email=Config.account.email,
-        phone=Config.account.phone,
-        description=Config.account.description,
-        type=AccountType.ADMIN,
-    ).create()
+    with unit_of_work():
+        account = Account.find(username=Config.account.username)
+        if account:
+            logger.info("Account %s already exists %s", Config.account.username, account[0].id)
+            return
+
+        account = Account(
+            username=Config.account.username,
+            password=Config.account.password,
+            email=Config.account.email,
+            phone=Config.account.phone,
+            description=Config.account.description,
+            type=AccountType.ADMIN,
+        ).create()
     logger.info("Account %s was just created with id %s", Config.account.username, account.id)
 
 
+register_job("shift_periodic_events", shift_periodic_events, interval=timedelta(days=1))
+register_job("materialize_occurrences", materialize_occurrences, interval=timedelta(days=1))
+register_job(
+    "refresh_autocomplete_terms", refresh_autocomplete_terms, interval=timedelta(minutes=5)
+)
+
+
+@app.on_event("startup")
+async def start_scheduler() -> None:
+    app.state.scheduler = asyncio.create_task(run_scheduler())
+
+
+@app.on_event("shutdown")
+async def stop_scheduler() -> None:
+    app.state.scheduler.cancel()
+
+
 @app.on_event("startup")
-@repeat_every(seconds=60 * 60 * 24)  # 1 day
-async def update_periodic_events() -> None:
-    logger.info("Updating periodic events")
-    today = datetime.today().replace(tzinfo=timezone.utc)
-    for event in Event.find(**{"!frequency": EventFrequency.NONE}):
-        if event.end_date > today:
-            continue
-
-        timedelta_args = dict([mapping_frequency_days[event.frequency]])
-        event.update(
-            start_date=event.start_date + timedelta(**timedelta_args),
-            end_date=event.end_date + timedelta(**timedelta_args),
-        )
-
-        [
-            activity.update(
-                start_date=activity.start_date + timedelta(**timedelta_args),
-                end_date=activity.end_date + timedelta(**timedelta_args),
-            )
-            for activity in event.activities
-        ]
+async def start_listener() -> None:
+    # Evicts the caches of this worker on the writes of the other ones
+    app.state.listener = asyncio.create_task(run_listener())
+
+
+@app.on_event("shutdown")
+async def stop_listener() -> None:
+    app.state.listener.cancel()
 
 
 @app.get(API_PREFIX)
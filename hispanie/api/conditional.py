@@ -0,0 +1,63 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response, status
+
+from ..action import acached_version, response_key
+
+
+def validators(key: tuple[str, str], last_modified: datetime | None, count: int) -> dict[str, str]:
+    """Return the ETag and Last-Modified headers of a response.
+
+    The ETag is weak, it identifies the rows and parameters of the response, not its bytes.
+    """
+    version = f"{key}|{last_modified.isoformat() if last_modified else ''}|{count}"
+    headers = {"ETag": f'W/"{hashlib.blake2b(version.encode(), digest_size=16).hexdigest()}"'}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    """Whether the client copy is still valid, If-None-Match taking precedence (RFC 9110)."""
+    if (if_none_match := request.headers.get("if-none-match")) is not None:
+        etag = headers["ETag"].removeprefix("W/")
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if (if_modified_since := request.headers.get("if-modified-since")) and (
+        last_modified := headers.get("Last-Modified")
+    ):
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # Dates without a zone are invalid, the header is ignored
+        return since.tzinfo is not None and parsedate_to_datetime(last_modified) <= since
+    return False
+
+
+async def aconditional(
+    request: Request,
+    endpoint: str,
+    params: dict[str, Any],
+    version: Callable[[], Awaitable[tuple[datetime | None, int]]],
+    content: Callable[[], Awaitable[bytes]],
+    cache_control: str,
+) -> Response:
+    """Return the JSON of `content`, or a 304 when the client copy matches its `version`.
+
+    The validator comes from a cheap aggregate query, the content is only built when it
+    changed.
+    """
+    last_modified, count = await acached_version(endpoint, params, version)
+    headers = {
+        "Cache-Control": cache_control,
+        **validators(response_key(endpoint, params), last_modified, count),
+    }
+    if is_not_modified(request, headers):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(await content(), media_type="application/json", headers=headers)
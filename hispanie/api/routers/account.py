@@ -15,6 +15,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from hispanie.schema import (
     AccountCreateRequest,
+    AccountPrincipal,
     AccountResponse,
     AccountUpdateRequest,
     ForgotPasswordRequest,
@@ -24,6 +25,7 @@ from hispanie.schema import (
 )
 
 from ...action import (
+    aread_accounts,
     authenticate_account,
     create_access_token,
     create_account,
@@ -33,10 +35,10 @@ from ...action import (
     handle_forgotten_password,
     handle_reset_password,
     is_reset_token_used,
-    read_accounts,
     update_account,
 )
 from ...config import Config
+from ...errors import PasswordWorkersBusy
 from ...model.account import Account, AccountType
 from ...utils import TOKEN_KEY_NAME
 
@@ -48,7 +50,7 @@ router = APIRouter(
 
 
 # Utility functions
-def ensure_admin_privileges(current_account: AccountResponse) -> None:
+def ensure_admin_privileges(current_account: AccountPrincipal) -> None:
     """Raise an HTTP exception if the current user is not an admin."""
     if current_account.type != AccountType.ADMIN:
         raise HTTPException(
@@ -73,7 +75,13 @@ async def login(
     refresh_token_id: str | None = Cookie(None),
 ) -> JSONResponse:
     """Authenticate a account and return an access token."""
-    account = authenticate_account(form_data.username, form_data.password)
+    try:
+        account = await authenticate_account(form_data.username, form_data.password)
+    except PasswordWorkersBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, retry later",
+        )
     if not account:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -116,12 +124,12 @@ async def logout(response: Response, _: None = Depends(get_current_account)) ->
 
 
 @router.post("/public/validate_reset_token")
-async def validate_reset_token(result: ValidateTokenRequest) -> bool:
+def validate_reset_token(result: ValidateTokenRequest) -> bool:
     return is_reset_token_used(result.token)
 
 
 @router.post("/public/forgot_password")
-async def forgot_password(
+def forgot_password(
     request: ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
 ) -> None:
@@ -141,7 +149,7 @@ async def reset_password(
 ) -> None:
     """Handle reset password request for a given account."""
     try:
-        handle_reset_password(**request.model_dump(exclude_none=True))
+        await handle_reset_password(**request.model_dump(exclude_none=True))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -155,7 +163,7 @@ async def create(
 ) -> Account:
     """Create a new account with the provided data."""
     try:
-        return create_account(account_data)
+        return await create_account(account_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error creating account: {e}"
@@ -165,15 +173,15 @@ async def create(
 # TODO add maybe a filter to get artists, users, and admin ?
 @router.get("/private/read", response_model=AccountResponse | list[AccountResponse])
 async def read(
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
     show_all: Annotated[bool, Query(description="Set to true to list all users if admin")] = False,
-) -> AccountResponse | list[Account]:
+) -> Account | list[Account]:
     """Get current user data or list all users if admin."""
     if show_all:
         ensure_admin_privileges(current_account)
-        return read_accounts()  # Replace with the method to fetch all users
+        return await aread_accounts()  # Replace with the method to fetch all users
 
-    return current_account
+    return await aread_accounts(current_account.id)
 
 
 # TODO check AccountCreateUpdateRequest because it could overide everything
@@ -181,11 +189,11 @@ async def read(
 @router.put("/private/update", response_model=AccountResponse)
 async def update(
     account_data: AccountUpdateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ) -> Account:
     """Update the current account with the provided data."""
     try:
-        return update_account(current_account.id, account_data)
+        return await update_account(current_account.id, account_data)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail=f"Error updating account: {e}"
@@ -193,8 +201,8 @@ async def update(
 
 
 @router.delete("/private/delete", response_model=AccountResponse)
-async def delete(
-    current_account: AccountResponse = Depends(get_current_account),
+def delete(
+    current_account: AccountPrincipal = Depends(get_current_account),
 ) -> Account:
     """Delete the current account."""
     try:
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from ...action import (
+    apaginate_activities,
     create_activity,
     delete_activity,
     get_current_account,
-    read_activities,
     update_activity,
 )
-from ...schema import ActivityCreateRequest, ActivityResponse, ActivityUpdateRequest
+from ...schema import ActivityCreateRequest, ActivityResponse, ActivityUpdateRequest, Page
+from ...typing import DEFAULT_PAGE_SIZE, PageCursor, PageLimit
 
 router = APIRouter(
     prefix="/activity",
@@ -17,7 +18,7 @@ router = APIRouter(
 
 
 @router.post("/private/create", response_model=ActivityResponse)
-async def create(
+def create(
     activity_data: ActivityCreateRequest,
     _: None = Depends(get_current_account),
 ):
@@ -28,20 +29,25 @@ async def create(
         raise HTTPException(status_code=400, detail=f"Error creating activity: {str(e)}")
 
 
-@router.get("/private/read", response_model=list[ActivityResponse])
+@router.get("/private/read", response_model=Page[ActivityResponse])
 async def read(
     event_id: str | None = None,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
     _: None = Depends(get_current_account),
 ):
     """Retrieve all activities for the authenticated account."""
     try:
-        return read_activities(**({"event_id": event_id} if event_id else {}))
+        items, next_cursor = await apaginate_activities(
+            limit, cursor, **({"event_id": event_id} if event_id else {})
+        )
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving activities: {str(e)}")
 
 
 @router.put("/private/update/{activity_id}", response_model=ActivityResponse)
-async def update(
+def update(
     activity_id: str,
     activity_update: ActivityUpdateRequest,
     _: None = Depends(get_current_account),
@@ -54,7 +60,7 @@ async def update(
 
 
 @router.delete("/private/delete/{activity_id}", response_model=ActivityResponse)
-async def delete(
+def delete(
     activity_id: str,
     _: None = Depends(get_current_account),
 ):
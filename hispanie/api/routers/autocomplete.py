@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from ...action import aautocomplete
+from ...action.autocomplete import AutocompleteKind
+from ...schema import AutocompleteResponse
+
+router = APIRouter(
+    prefix="/autocomplete",
+    tags=["autocomplete"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+# Suggest tags, cities or events
+@router.get("", response_model=list[AutocompleteResponse])
+async def autocomplete(
+    kind: AutocompleteKind,
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+):
+    """Suggest tag names, cities or upcoming event names matching the typed text."""
+    try:
+        return await aautocomplete(kind, q, limit)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error autocompleting: {str(e)}")
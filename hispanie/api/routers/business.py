@@ -1,17 +1,43 @@
-from typing import List
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
-from hispanie.schema import AccountResponse
+from hispanie.schema import AccountPrincipal
 
 from ...action import (
+    acached_item,
+    acached_page,
+    anearby_businesses,
+    apaginate_businesses,
+    aread_businesses,
+    aversion_businesses,
     create_business,
     delete_business,
     get_current_account,
-    read_businesses,
     update_business,
 )
-from ...schema import BusinessCreateRequest, BusinessResponse, BusinessUpdateRequest
+from ...errors import Forbidden
+from ...model import AccountType
+from ...schema import (
+    BusinessCreateRequest,
+    BusinessFilterParams,
+    BusinessNearbyResponse,
+    BusinessResponse,
+    BusinessUpdateRequest,
+    Page,
+)
+from ...typing import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RADIUS,
+    Latitude,
+    Longitude,
+    PageLimit,
+    Radius,
+)
+from ..conditional import aconditional
+
+# Clients and CDNs may reuse a public response for 30 seconds, then revalidate it
+CACHE_CONTROL = "public, max-age=30, must-revalidate"
 
 router = APIRouter(
     prefix="/businesses",
@@ -22,9 +48,9 @@ router = APIRouter(
 
 # Create Business using token
 @router.post("/private/create", response_model=BusinessResponse)
-async def create(
+def create(
     business_data: BusinessCreateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Create a new business for the authenticated account."""
     try:
@@ -34,49 +60,122 @@ async def create(
 
 
 # Read Business using token
-@router.get("/private/read", response_model=List[BusinessResponse])
+@router.get("/private/read", response_model=Page[BusinessResponse])
 async def read_private(
-    current_account: AccountResponse = Depends(get_current_account),
+    params: Annotated[BusinessFilterParams, Query()],
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Retrieve all public events."""
     try:
-        return read_businesses(account_id=current_account.id)
+        items, next_cursor = await apaginate_businesses(
+            params.limit, params.cursor, account_id=current_account.id, **params.filters()
+        )
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving business: {str(e)}")
 
 
 # Read Business
-@router.get("/public/read", response_model=List[BusinessResponse])
-async def read_public():
-    """Retrieve all public business."""
+@router.get("/public/read", response_model=Page[BusinessResponse])
+async def read_public(
+    request: Request,
+    params: Annotated[BusinessFilterParams, Query()],
+):
+    """Retrieve all public business, a 304 when the matching businesses did not change."""
+    try:
+        filters = params.filters()
+        return await aconditional(
+            request,
+            "businesses.public.read",
+            params.model_dump(),
+            lambda: aversion_businesses(**filters),
+            lambda: acached_page(
+                "businesses.public.read",
+                params.model_dump(),
+                BusinessResponse,
+                lambda: apaginate_businesses(params.limit, params.cursor, **filters),
+            ),
+            CACHE_CONTROL,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving business: {str(e)}")
+
+
+# Read a Business without token
+@router.get("/public/read/{business_id}", response_model=BusinessResponse)
+async def read_one_public(request: Request, business_id: str):
+    """Retrieve a business by its ID, a 304 when it did not change."""
+    try:
+        return await aconditional(
+            request,
+            "businesses.public.read_one",
+            {"id": business_id},
+            lambda: aversion_businesses(id=business_id, is_public=True),
+            lambda: acached_item(
+                "businesses.public.read_one",
+                {"id": business_id},
+                BusinessResponse,
+                lambda: aread_businesses(business_id, public=True),
+            ),
+            CACHE_CONTROL,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving business: {str(e)}")
+
+
+# Read the Businesses closest to a point
+@router.get("/public/nearby", response_model=list[BusinessNearbyResponse])
+async def read_nearby(
+    lat: Latitude,
+    lon: Longitude,
+    radius: Radius = DEFAULT_RADIUS,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+):
+    """Retrieve the businesses within `radius` meters of a point, closest first."""
     try:
-        return read_businesses()
+        rows = await anearby_businesses(lat, lon, radius, limit)
+        return [{"business": business, "distance": distance} for business, distance in rows]
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving business: {str(e)}")
 
 
 # Update Business using token
 @router.put("/private/update/{business_id}", response_model=BusinessResponse)
-async def update(
+def update(
     business_id: str,
     business_update: BusinessUpdateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Update an business by its ID. The business must belong to the current account."""
     try:
-        return update_business(business_id, current_account.id, business_update)
+        return update_business(
+            business_id,
+            current_account.id,
+            business_update,
+            is_admin=current_account.type == AccountType.ADMIN,
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Error updating business: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error updating event: {str(e)}")
 
 
 # Delete Business using token
 @router.delete("/private/delete/{business_id}", response_model=BusinessResponse)
-async def delete(
+def delete(
     business_id: str,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Delete an business by its ID. The business must belong to the current account."""
     try:
-        return delete_business(business_id, current_account.id)
+        return delete_business(
+            business_id, current_account.id, is_admin=current_account.type == AccountType.ADMIN
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Error deleting business: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting event: {str(e)}")
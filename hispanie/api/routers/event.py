@@ -1,9 +1,47 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Annotated
 
-from hispanie.schema import AccountResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
-from ...action import create_event, delete_event, get_current_account, read_events, update_event
-from ...schema import EventCreateRequest, EventResponse, EventUpdateRequest
+from hispanie.schema import AccountPrincipal
+
+from ...action import (
+    acached_item,
+    acached_page,
+    anearby_events,
+    apaginate_events,
+    apaginate_occurrences,
+    aread_events,
+    aversion_events,
+    create_event,
+    delete_event,
+    get_current_account,
+    update_event,
+)
+from ...errors import Forbidden
+from ...model import AccountType
+from ...schema import (
+    EventCreateRequest,
+    EventFilterParams,
+    EventNearbyResponse,
+    EventOccurrenceResponse,
+    EventResponse,
+    EventUpdateRequest,
+    Page,
+)
+from ...typing import (
+    DEFAULT_PAGE_SIZE,
+    DEFAULT_RADIUS,
+    Latitude,
+    Longitude,
+    PageCursor,
+    PageLimit,
+    Radius,
+)
+from ..conditional import aconditional
+
+# Clients and CDNs may reuse a public response for 30 seconds, then revalidate it
+CACHE_CONTROL = "public, max-age=30, must-revalidate"
 
 router = APIRouter(
     prefix="/events",
@@ -14,9 +52,9 @@ router = APIRouter(
 
 # Create Event using token
 @router.post("/private/create", response_model=EventResponse)
-async def create(
+def create(
     event_data: EventCreateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Create a new event for the authenticated account."""
     try:
@@ -26,49 +64,140 @@ async def create(
 
 
 # Read Events using token
-@router.get("/private/read", response_model=list[EventResponse])
+@router.get("/private/read", response_model=Page[EventResponse])
 async def read_private(
-    current_account: AccountResponse = Depends(get_current_account),
+    params: Annotated[EventFilterParams, Query()],
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Retrieve all events for the authenticated account."""
     try:
-        return read_events(account_id=current_account.id)
+        items, next_cursor = await apaginate_events(
+            params.limit, params.cursor, account_id=current_account.id, **params.filters()
+        )
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving events: {str(e)}")
 
 
 # Read Events using token
-@router.get("/public/read", response_model=list[EventResponse])
-async def read_public():
-    """Retrieve all events for the authenticated account."""
+@router.get("/public/read", response_model=Page[EventResponse])
+async def read_public(
+    request: Request,
+    params: Annotated[EventFilterParams, Query()],
+):
+    """Retrieve the public events, a 304 when the matching events did not change."""
+    try:
+        filters = params.filters()
+        return await aconditional(
+            request,
+            "events.public.read",
+            params.model_dump(),
+            lambda: aversion_events(**filters),
+            lambda: acached_page(
+                "events.public.read",
+                params.model_dump(),
+                EventResponse,
+                lambda: apaginate_events(params.limit, params.cursor, **filters),
+            ),
+            CACHE_CONTROL,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving events: {str(e)}")
+
+
+# Read an Event without token
+@router.get("/public/read/{event_id}", response_model=EventResponse)
+async def read_one_public(request: Request, event_id: str):
+    """Retrieve an event by its ID, a 304 when it did not change."""
+    try:
+        return await aconditional(
+            request,
+            "events.public.read_one",
+            {"id": event_id},
+            lambda: aversion_events(id=event_id, is_public=True),
+            lambda: acached_item(
+                "events.public.read_one",
+                {"id": event_id},
+                EventResponse,
+                lambda: aread_events(event_id, public=True),
+            ),
+            CACHE_CONTROL,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving event: {str(e)}")
+
+
+# Read the Events closest to a point
+@router.get("/public/nearby", response_model=list[EventNearbyResponse])
+async def read_nearby(
+    lat: Latitude,
+    lon: Longitude,
+    radius: Radius = DEFAULT_RADIUS,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+):
+    """Retrieve the events within `radius` meters of a point, closest first."""
     try:
-        return read_events()
+        rows = await anearby_events(lat, lon, radius, limit)
+        return [{"event": event, "distance": distance} for event, distance in rows]
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving events: {str(e)}")
 
 
+# Read the occurrences of the Events in a date range
+@router.get("/public/calendar", response_model=Page[EventOccurrenceResponse])
+async def read_calendar(
+    from_date: datetime = Query(alias="from", description="Inclusive lower bound"),
+    to_date: datetime = Query(alias="to", description="Exclusive upper bound"),
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
+):
+    """Retrieve the occurrences of the events, recurring ones included, starting in a range."""
+    if from_date >= to_date:
+        raise HTTPException(status_code=400, detail="`from` must be before `to`")
+    try:
+        items, next_cursor = await apaginate_occurrences(from_date, to_date, limit, cursor)
+        return {"items": items, "next_cursor": next_cursor}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving calendar: {str(e)}")
+
+
 # Update Event
 @router.put("/private/update/{event_id}", response_model=EventResponse)
-async def update(
+def update(
     event_id: str,
     event_update: EventUpdateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Update an event by its ID. The event must belong to the current account."""
     try:
-        return update_event(event_id, current_account.id, event_update)
+        return update_event(
+            event_id,
+            current_account.id,
+            event_update,
+            is_admin=current_account.type == AccountType.ADMIN,
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Error updating event: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error updating event: {str(e)}")
 
 
 # Delete Event
 @router.delete("/private/delete/{event_id}", response_model=EventResponse)
-async def delete(
+def delete(
     event_id: str,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Delete an event by its ID. The event must belong to the current account."""
     try:
-        return delete_event(event_id, current_account.id)
+        return delete_event(
+            event_id, current_account.id, is_admin=current_account.type == AccountType.ADMIN
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Error deleting event: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting event: {str(e)}")
@@ -1,22 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 
-from hispanie.schema import AccountResponse
+from hispanie.schema import AccountPrincipal
 
 from ...action import (
+    acached_page,
+    apaginate_files,
+    aversion_files,
     create_file,
     delete_file,
     generate_download_presigned_url,
     generate_upload_presigned_url,
     get_current_account,
-    read_files,
     update_file,
 )
+from ...errors import Forbidden
+from ...model import AccountType
 from ...schema import (
     FileCreateRequest,
     FileGeneratePresignedUrlResponse,
     FileResponse,
     FileUpdateRequest,
+    Page,
 )
+from ...typing import DEFAULT_PAGE_SIZE, PageCursor, PageLimit
+from ..conditional import aconditional
+
+# Files are rarely edited, clients and CDNs may reuse them for 5 minutes
+CACHE_CONTROL = "public, max-age=300, must-revalidate"
 
 router = APIRouter(
     prefix="/files",
@@ -56,9 +66,9 @@ async def download_presigned_url(
 
 # Create Event using token
 @router.post("/private/create", response_model=FileResponse)
-async def create(
+def create(
     file_data: FileCreateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Create a new event for the authenticated account."""
     try:
@@ -69,50 +79,85 @@ async def create(
 
 # TODO confirm if it's usefull
 # Read Events using token
-@router.get("/private/read", response_model=list[FileResponse])
+@router.get("/private/read", response_model=Page[FileResponse])
 async def read_private(
-    current_account: AccountResponse = Depends(get_current_account),
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Retrieve all events for the authenticated account."""
     try:
-        return read_files(account_id=current_account.id)
+        items, next_cursor = await apaginate_files(limit, cursor, account_id=current_account.id)
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving events: {str(e)}")
 
 
 # TODO confirm if it's usefull
 # Read Events using token
-@router.get("/public/read", response_model=list[FileResponse])
-async def read_public():
-    """Retrieve all events for the authenticated account."""
+@router.get("/public/read", response_model=Page[FileResponse])
+async def read_public(
+    request: Request,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
+):
+    """Retrieve all public files, a 304 when they did not change."""
     try:
-        return read_files(is_public=True)
+        params = {"limit": limit, "cursor": cursor}
+        return await aconditional(
+            request,
+            "files.public.read",
+            params,
+            lambda: aversion_files(public=True),
+            lambda: acached_page(
+                "files.public.read",
+                params,
+                FileResponse,
+                lambda: apaginate_files(limit, cursor, public=True),
+            ),
+            CACHE_CONTROL,
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving events: {str(e)}")
 
 
 # Update Event
 @router.put("/private/update/{file_id}", response_model=FileResponse)
-async def update(
+def update(
     file_id: str,
     event_update: FileUpdateRequest,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Update an event by its ID. The event must belong to the current account."""
     try:
-        return update_file(file_id, current_account.id, event_update)
+        return update_file(
+            file_id,
+            current_account.id,
+            event_update,
+            is_admin=current_account.type == AccountType.ADMIN,
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Error updating event: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error updating event: {str(e)}")
 
 
 # Delete Event
 @router.delete("/private/delete/{file_id}", response_model=FileResponse)
-async def delete(
+def delete(
     file_id: str,
-    current_account: AccountResponse = Depends(get_current_account),
+    current_account: AccountPrincipal = Depends(get_current_account),
 ):
     """Delete an event by its ID. The event must belong to the current account."""
     try:
-        return delete_file(file_id, current_account.id)
+        return delete_file(
+            file_id, current_account.id, is_admin=current_account.type == AccountType.ADMIN
+        )
+    except Forbidden as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail=f"Error deleting event: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting event: {str(e)}")
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from ...action import acluster_map
+from ...schema import ClusterResponse
+
+router = APIRouter(
+    prefix="/map",
+    tags=["map"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """Parse a `min_lon,min_lat,max_lon,max_lat` bounding box."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid bbox {bbox}")
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise HTTPException(status_code=400, detail=f"Invalid bbox {bbox}")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+# Read clusters of Events and Businesses
+@router.get("/clusters", response_model=list[ClusterResponse])
+async def read_clusters(
+    bbox: str = Query(..., description="Bounding box as min_lon,min_lat,max_lon,max_lat"),
+    zoom: int = Query(..., ge=0, le=20, description="Zoom level of the map"),
+):
+    """Retrieve the events and businesses of the visible map grouped in grid clusters."""
+    bounds = parse_bbox(bbox)
+    try:
+        return await acluster_map(bounds, zoom)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving clusters: {str(e)}")
@@ -0,0 +1,24 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from hispanie.schema import AccountPrincipal
+
+from ...action import get_current_account
+from ...metrics import collect
+from .account import ensure_admin_privileges
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/private/read")
+async def read(
+    current_account: AccountPrincipal = Depends(get_current_account),
+) -> dict[str, Any]:
+    """Retrieve the process metrics (database pool, caches). Admin only."""
+    ensure_admin_privileges(current_account)
+    return collect()
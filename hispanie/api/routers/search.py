@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from ...action import asearch
+from ...action.search import SearchKind
+from ...schema import Page, SearchHitResponse
+from ...typing import DEFAULT_PAGE_SIZE, PageCursor, PageLimit
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+# Search Events and Businesses
+@router.get("", response_model=Page[SearchHitResponse])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Web search style query"),
+    kind: SearchKind | None = None,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
+):
+    """Search events and businesses by name, tags, description and city, best matches first."""
+    try:
+        items, next_cursor = await asearch(q, limit, cursor, kind)
+        return {"items": items, "next_cursor": next_cursor}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error searching: {str(e)}")
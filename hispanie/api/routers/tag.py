@@ -1,7 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 
-from ...action import create_tag, delete_tag, get_current_account, read_tags, update_tag
-from ...schema import TagCreateRequest, TagResponse, TagUpdateRequest
+from ...action import (
+    acached_page,
+    apaginate_tags,
+    aversion_tags,
+    create_tag,
+    delete_tag,
+    get_current_account,
+    update_tag,
+)
+from ...schema import Page, TagCreateRequest, TagResponse, TagUpdateRequest
+from ...typing import DEFAULT_PAGE_SIZE, PageCursor, PageLimit
+from ..conditional import aconditional
+
+# The tag catalogue barely changes, clients and CDNs may reuse it for 5 minutes
+CACHE_CONTROL = "public, max-age=300, must-revalidate"
 
 router = APIRouter(
     prefix="/tags",
@@ -12,7 +25,7 @@ router = APIRouter(
 
 # Create Tag using token
 @router.post("/private/create", response_model=TagResponse)
-async def create(
+def create(
     tag_data: TagCreateRequest,
     _: None = Depends(get_current_account),
 ):
@@ -24,20 +37,47 @@ async def create(
 
 
 # Read Tags using token
-@router.get("/private/read", response_model=list[TagResponse])
+@router.get("/private/read", response_model=Page[TagResponse])
 async def read(
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
     _: None = Depends(get_current_account),
 ):
     """Retrieve all tag for the authenticated account."""
     try:
-        return read_tags()
+        items, next_cursor = await apaginate_tags(limit, cursor)
+        return {"items": items, "next_cursor": next_cursor}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error retrieving tags: {str(e)}")
+
+
+# Read Tags without token
+@router.get("/public/read", response_model=Page[TagResponse])
+async def read_public(
+    request: Request,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
+):
+    """Retrieve all tags, a 304 when they did not change."""
+    try:
+        params = {"limit": limit, "cursor": cursor}
+        return await aconditional(
+            request,
+            "tags.public.read",
+            params,
+            aversion_tags,
+            lambda: acached_page(
+                "tags.public.read", params, TagResponse, lambda: apaginate_tags(limit, cursor)
+            ),
+            CACHE_CONTROL,
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving tags: {str(e)}")
 
 
 # Update Tag
 @router.put("/private/update/{tag_id}", response_model=TagResponse)
-async def update(
+def update(
     tag_id: str,
     tag_update: TagUpdateRequest,
     _: None = Depends(get_current_account),
@@ -51,7 +91,7 @@ async def update(
 
 # Delete Tag
 @router.delete("/private/delete/{tag_id}", response_model=TagResponse)
-async def delete(
+def delete(
     tag_id: str,
     _: None = Depends(get_current_account),
 ):
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from ...action import (
+    apaginate_tickets,
     create_ticket,
     delete_ticket,
     get_current_account,
-    read_tickets,
     update_ticket,
 )
-from ...schema import TicketCreateRequest, TicketResponse, TicketUpdateRequest
+from ...schema import Page, TicketCreateRequest, TicketResponse, TicketUpdateRequest
+from ...typing import DEFAULT_PAGE_SIZE, PageCursor, PageLimit
 
 router = APIRouter(
     prefix="/ticket",
@@ -17,7 +18,7 @@ router = APIRouter(
 
 
 @router.post("/private/create", response_model=TicketResponse)
-async def create(
+def create(
     ticket_data: TicketCreateRequest,
     _: None = Depends(get_current_account),
 ):
@@ -28,20 +29,25 @@ async def create(
         raise HTTPException(status_code=400, detail=f"Error creating ticket: {str(e)}")
 
 
-@router.get("/private/read", response_model=list[TicketResponse])
+@router.get("/private/read", response_model=Page[TicketResponse])
 async def read(
     event_id: str | None = None,
+    limit: PageLimit = DEFAULT_PAGE_SIZE,
+    cursor: PageCursor = None,
     _: None = Depends(get_current_account),
 ):
     """Retrieve all tickets for the authenticated account."""
     try:
-        return read_tickets(**({"event_id": event_id} if event_id else {}))
+        items, next_cursor = await apaginate_tickets(
+            limit, cursor, **({"event_id": event_id} if event_id else {})
+        )
+        return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error retrieving tickets: {str(e)}")
 
 
 @router.put("/private/update/{ticket_id}", response_model=TicketResponse)
-async def update(
+def update(
     ticket_id: str,
     ticket_update: TicketUpdateRequest,
     _: None = Depends(get_current_account),
@@ -54,7 +60,7 @@ async def update(
 
 
 @router.delete("/private/delete/{ticket_id}", response_model=TicketResponse)
-async def delete(
+def delete(
     ticket_id: str,
     _: None = Depends(get_current_account),
 ):
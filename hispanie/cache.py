@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+from .metrics import Counter, register
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries expire `ttl` seconds after being set.
+
+    With `maxbytes` the entries, measured by `sizeof`, are also evicted past that total size.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        name: str | None = None,
+        maxbytes: int | None = None,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof or (lambda _: 0)
+        self.hits = Counter()
+        self.misses = Counter()
+        self._data: OrderedDict[K, tuple[float, V, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if name:
+            register(f"cache.{name}", self.stats)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._pop(key)
+                self.misses.inc()
+                return default
+            self._data.move_to_end(key)
+        self.hits.inc()
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._data[key] = (expires, value, size)
+            self._bytes += size
+            while len(self._data) > self.maxsize or (
+                self.maxbytes is not None and self._bytes > self.maxbytes
+            ):
+                self._pop(next(iter(self._data)))
+
+    def evict(self, predicate: Callable[[K, V], bool]) -> int:
+        """Remove the entries matching `predicate` and return how many were removed."""
+        with self._lock:
+            keys = [key for key, (_, value, _) in self._data.items() if predicate(key, value)]
+            for key in keys:
+                self._pop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits.value,
+            "misses": self.misses.value,
+        }
+
+    def _pop(self, key: K) -> None:
+        """Remove `key`, the lock must be held."""
+        self._bytes -= self._data.pop(key)[2]
+
+
+class SingleFlight(Generic[K, V]):
+    """Share one in-flight call among the concurrent callers of the same key.
+
+    The call runs in its own task, a cancelled caller does not cancel it for the others.
+    """
+
+    def __init__(self, name: str | None = None) -> None:
+        self.calls = Counter()
+        self.coalesced = Counter()
+        self._flights: dict[K, asyncio.Task[V]] = {}
+        if name:
+            register(f"singleflight.{name}", self.stats)
+
+    async def do(self, key: K, call: Callable[[], Awaitable[V]]) -> V:
+        if (task := self._flights.get(key)) is not None:
+            self.coalesced.inc()
+        else:
+            self.calls.inc()
+            task = asyncio.ensure_future(call())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls.value,
+            "coalesced": self.coalesced.value,
+        }
@@ -22,6 +22,12 @@ class Database:
     user: str
     ref_table: str
     force_recreate: str = "0"
+    pool_size: str = "5"
+    max_overflow: str = "10"
+    pool_timeout: str = "30"
+    pool_recycle: str = "1800"
+    pool_pre_ping: str = "1"
+    statement_timeout: str = "30000"  # milliseconds, 0 disables it
 
 
 @dataclass
@@ -29,6 +35,8 @@ class JWT:
     secret_key: str
     algorithm: str
     access_token_expire_minutes: str
+    principal_cache_ttl: str = "60"  # seconds
+    principal_cache_size: str = "10000"
 
 
 @dataclass
@@ -56,6 +64,34 @@ class AWS:
     region: str
 
 
+@dataclass
+class Security:
+    bcrypt_rounds: str = "12"
+    password_workers: str = "4"
+    password_queue_size: str = "64"
+
+
+@dataclass
+class Calendar:
+    horizon_days: str = "365"  # how far ahead recurring events are materialized
+
+
+@dataclass
+class Search:
+    # Text search configurations, comma separated, run `hispanie-reindex-search` after a change
+    languages: str = "spanish,french,english"
+
+
+@dataclass
+class Cache:
+    response_ttl: str = "30"  # seconds
+    response_size: str = "10000"  # entries
+    response_bytes: str = "67108864"  # serialized responses total size
+    entity_ttl: str = "3600"  # seconds, entries are keyed by the version of their row
+    entity_size: str = "100000"  # entries
+    entity_bytes: str = "134217728"  # serialized entities total size
+
+
 @dataclass
 class Account:
     username: str
@@ -73,6 +109,10 @@ class Config:
     email: Email
     aws: AWS
     account: Account
+    security: Security
+    calendar: Calendar
+    search: Search
+    cache: Cache
 
 
 def bootstrap_configuration(path: str | Path = ROOT.joinpath("hispanie.ini")) -> None:
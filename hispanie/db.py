@@ -1,12 +1,23 @@
-from contextlib import contextmanager
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Any, AsyncIterator, Iterator
 
 from psycopg2 import errors as pgsql_errors
 from sqlalchemy import text
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine.base import Connection, Engine
 from sqlalchemy.exc import SQLAlchemyError, StatementError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from alembic.command import upgrade
 from alembic.config import Config as AlembicConfig
@@ -15,6 +26,7 @@ from alembic.script import ScriptDirectory
 
 from .config import Config, Database, logging
 from .errors import DBError
+from .metrics import register
 
 ROOT = Path(__file__).parents[1]
 ALEMBIC_PATH = ROOT.joinpath("alembic")
@@ -22,11 +34,114 @@ ALEMBIC_PATH = ROOT.joinpath("alembic")
 logger = logging.getLogger(__name__)
 
 
+_engines: dict[str, Engine] = {}
+_async_engines: dict[str, AsyncEngine] = {}
+_engines_lock = threading.Lock()
+
+
+class PoolStats:
+    """Checkout wait times of a connection pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+
+class TimedCheckoutMixin:
+    """Record in `stats` how long each checkout waited for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_engine_options(db: Database) -> dict[str, Any]:
+    return {
+        "pool_size": int(db.pool_size),
+        "max_overflow": int(db.max_overflow),
+        "pool_timeout": int(db.pool_timeout),
+        "pool_recycle": int(db.pool_recycle),
+        "pool_pre_ping": bool(int(db.pool_pre_ping)),
+    }
+
+
 def get_engine(db: Database, suffix: str | None = None) -> Engine:
+    """Return the process-wide engine for the given database, creating it once."""
     sqlalchemy_url = f"postgresql://{db.user}:{db.password}@{db.host}:{db.port}/{db.database}"
     if suffix:
         sqlalchemy_url += suffix
-    return create_engine(sqlalchemy_url)
+    options = get_engine_options(db)
+    if statement_timeout := int(db.statement_timeout):
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    with _engines_lock:
+        if (engine := _engines.get(sqlalchemy_url)) is None:
+            logger.info("Creating database engine for %s", db.database)
+            engine = _engines[sqlalchemy_url] = create_engine(
+                sqlalchemy_url, poolclass=InstrumentedQueuePool, **options
+            )
+    return engine
+
+
+def get_async_engine(db: Database) -> AsyncEngine:
+    """Return the process-wide asyncio engine (asyncpg) for the given database."""
+    sqlalchemy_url = (
+        f"postgresql+asyncpg://{db.user}:{db.password}@{db.host}:{db.port}/{db.database}"
+    )
+    options = get_engine_options(db)
+    if statement_timeout := int(db.statement_timeout):
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(statement_timeout)}}
+    with _engines_lock:
+        if (engine := _async_engines.get(sqlalchemy_url)) is None:
+            logger.info("Creating async database engine for %s", db.database)
+            engine = _async_engines[sqlalchemy_url] = create_async_engine(
+                sqlalchemy_url, poolclass=InstrumentedAsyncQueuePool, **options
+            )
+    return engine
+
+
+def pool_metrics() -> dict[str, dict[str, Any]]:
+    """Gauges of every engine pool, keyed by the url without password."""
+    metrics = {}
+    engines = [*_engines.values(), *(engine.sync_engine for engine in _async_engines.values())]
+    for engine in engines:
+        pool = engine.pool
+        stats: PoolStats = pool.stats
+        metrics[engine.url.render_as_string(hide_password=True)] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "checkouts": stats.checkouts,
+            "wait_avg": stats.wait_total / stats.checkouts if stats.checkouts else 0.0,
+            "wait_max": stats.wait_max,
+        }
+    return metrics
+
+
+register("database_pool", pool_metrics)
 
 
 def check_db_connection(db: Database) -> None:
@@ -37,7 +152,16 @@ def check_db_connection(db: Database) -> None:
 def init() -> sessionmaker:
     logger.info("Initialising database session")
     engine = get_engine(Config.database)
-    return sessionmaker(bind=engine)
+    # Objects outlive the commit for the rest of the request (response serialization), so keep
+    # their loaded state instead of reloading every attribute after each commit.
+    return sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def init_async() -> async_sessionmaker[AsyncSession]:
+    logger.info("Initialising async database session")
+    engine = get_async_engine(Config.database)
+    # Lazy loads are not possible once an async session committed, keep the loaded state
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
 
 
 def open_session(
@@ -96,6 +220,9 @@ def update(conn: Connection, exists: bool, dry_run: bool = False) -> None:
     if exists:
         if current_head != script_head:
             logger.info("Upgrading database to: %s", script_head)
+            # Alembic owns the transactions of the upgrade, indexes are built concurrently
+            # outside of them
+            conn.commit()
             upgrade(config, "head")
             conn.commit()
         else:
@@ -123,12 +250,113 @@ def initialize(update_schema: bool = False) -> None:
             raise RuntimeError("Database is not up-to-date")
 
 
-session = open_session(init())
+session_factory = init()
+async_session_factory = init_async()
+
+_session: ContextVar[Session | None] = ContextVar("session", default=None)
+_async_session: ContextVar[AsyncSession | None] = ContextVar("async_session", default=None)
+
+
+def get_session() -> Session:
+    """Return the session bound to the current unit of work.
+
+    Code running outside of `unit_of_work` (scripts, shell) lazily gets a session bound to its
+    own context.
+    """
+    if (session := _session.get()) is None:
+        logger.debug("No unit of work in scope, opening a context session")
+        session = open_session(session_factory)
+        _session.set(session)
+    return session
+
+
+@contextmanager
+def unit_of_work() -> Iterator[Session]:
+    """Bind a fresh session to the current context for the duration of the block."""
+    previous = _session.get()
+    session = open_session(session_factory)
+    _session.set(session)
+    try:
+        yield session
+    finally:
+        session.close()
+        _session.set(previous)
+
+
+def get_async_session() -> AsyncSession:
+    """Return the async session bound to the current unit of work."""
+    if (session := _async_session.get()) is None:
+        logger.debug("No async unit of work in scope, opening a context session")
+        session = async_session_factory()
+        _async_session.set(session)
+    return session
+
+
+@asynccontextmanager
+async def async_unit_of_work() -> AsyncIterator[AsyncSession]:
+    """Bind a fresh async session to the current context for the duration of the block."""
+    previous = _async_session.get()
+    session = async_session_factory()
+    _async_session.set(session)
+    try:
+        yield session
+    finally:
+        await session.close()
+        _async_session.set(previous)
+
+
+async def request_session() -> AsyncIterator[Session]:
+    """FastAPI dependency opening one unit of work per request.
+
+    Sessions only check out a connection on first use, requests touching a single path do not
+    hold a connection of the other pool.
+    """
+    with unit_of_work() as session:
+        async with async_unit_of_work():
+            yield session
+
+
+@contextmanager
+def transaction() -> Iterator[Session]:
+    """Run the block in a single transaction of the current session.
+
+    The session scopes inside of it only flush, the outermost block commits once or rolls the
+    whole of it back.
+    """
+    session = get_session()
+    if session.info.get("transaction"):
+        yield session
+        return
+
+    session.info["transaction"] = True
+    try:
+        yield session
+        session.commit()
+    except SQLAlchemyError as e:
+        session.rollback()
+        logger.error(f"Session rollback due to exception: {e}")
+        raise DBError()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.info.pop("transaction", None)
 
 
 @contextmanager
 def session_scope():
     """Provide a transactional scope around a series of operations."""
+    session = get_session()
+    if session.info.get("transaction"):
+        # Part of an enclosing transaction, which commits or rolls back
+        try:
+            yield session
+            session.flush()
+        except SQLAlchemyError as e:
+            logger.error(f"Flush failed in transaction: {e}")
+            raise DBError()
+        return
+
     try:
         yield session
         session.commit()
@@ -136,3 +364,16 @@ def session_scope():
         session.rollback()
         logger.error(f"Session rollback due to exception: {e}")
         raise DBError()
+
+
+@asynccontextmanager
+async def async_session_scope():
+    """Provide a transactional scope around a series of async operations."""
+    session = get_async_session()
+    try:
+        yield session
+        await session.commit()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(f"Session rollback due to exception: {e}")
+        raise DBError()
@@ -25,6 +25,18 @@ class DBError(Error):
     description = "Error occurred while performing a database action."
 
 
+class PasswordWorkersBusy(Error):
+    code = 901
+    reason = "password-workers-busy"
+    description = "Too many password operations in progress, retry later."
+
+
+class Forbidden(Error):
+    code = 902
+    reason = "forbidden"
+    description = "The resource belongs to another account."
+
+
 class NoDataFound(Error):
     code = 1000
     reason = "no-data-found"
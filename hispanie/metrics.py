@@ -0,0 +1,29 @@
+import threading
+from typing import Any, Callable
+
+_collectors: dict[str, Callable[[], Any]] = {}
+
+
+class Counter:
+    """Thread-safe monotonic counter."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+def register(name: str, collector: Callable[[], Any]) -> None:
+    """Expose the values returned by `collector` under `name`."""
+    _collectors[name] = collector
+
+
+def collect() -> dict[str, Any]:
+    return {name: collector() for name, collector in _collectors.items()}
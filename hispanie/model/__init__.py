@@ -1,11 +1,14 @@
 from .account import Account, AccountType
 from .activity import Activity
-from .base import Base, T
+from .autocomplete_term import autocomplete_term
+from .base import Base, T, load_options
 from .business import Business, BusinessCategory
 from .business_tag import BusinessTag
 from .event import Event, EventCategory, EventFrequency
+from .event_occurrence import EventOccurrence
 from .event_tag import EventTag
 from .file import File, FileCategory
+from .job_run import JobRun
 from .reset_token import ResetToken
 from .social_network import SocialNetwork
 from .tag import Tag
@@ -24,11 +27,15 @@ __all__ = [
     "Event",
     "EventCategory",
     "EventFrequency",
+    "EventOccurrence",
     "EventTag",
     "File",
     "FileCategory",
+    "JobRun",
     "ResetToken",
     "SocialNetwork",
     "Tag",
     "Ticket",
+    "autocomplete_term",
+    "load_options",
 ]
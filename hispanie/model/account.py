@@ -3,7 +3,8 @@ from enum import Enum
 from sqlalchemy import LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from ..utils import generate_password_hash, idun
+from ..password import hash_password
+from ..utils import idun
 from .base import Base
 from .business import Business
 from .event import Event
@@ -38,7 +39,7 @@ class Account(Base, Resource):
         password (str): Setter for the password, which hashes the input string before storage.
 
     Notes:
-        - Passwords are securely hashed using the `generate_password_hash` utility.
+        - Passwords are securely hashed using the `hash_password` utility.
         - The `email` field is enforced as unique, and error handling for uniqueness violations is expected in application logic.
         - The `username` field's uniqueness should also be validated.
         - The `type` field categorizes the account as either a regular user or an admin.
@@ -94,4 +95,4 @@ class Account(Base, Resource):
     @password.setter
     def password(self, value: str) -> None:
         """Setter to hash and store the password."""
-        self._password = generate_password_hash(value)
+        self._password = hash_password(value)
@@ -22,7 +22,7 @@ class Activity(Base, Resource):
 
     end_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
-    event_id: Mapped[str] = mapped_column(ForeignKey("event.id"))
+    event_id: Mapped[str] = mapped_column(ForeignKey("event.id", ondelete="CASCADE"))
 
     __table_args__ = (
         CheckConstraint("end_date > start_date", name="check_end_date_after_start_date"),
@@ -0,0 +1,43 @@
+from typing import Any
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, text
+
+from .base import Base
+
+# Materialized view of the tag and city suggestions with their popularity, the number of events
+# and businesses using them. Kept out of Base.metadata as create_all cannot build views.
+autocomplete_term = Table(
+    "autocomplete_term",
+    MetaData(),
+    Column("kind", String, nullable=False),
+    Column("term", String, nullable=False),
+    Column("ref_id", String),
+    Column("popularity", Integer, nullable=False),
+)
+
+# Definition of the view, migration 0008 freezes a copy of it. Change it in a new revision.
+AUTOCOMPLETE_TERM_DDL = (
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS autocomplete_term AS
+    SELECT 'tag' AS kind, tag.name AS term, tag.id AS ref_id,
+        (SELECT count(*) FROM event_tag WHERE event_tag.tag_id = tag.id)
+        + (SELECT count(*) FROM business_tag WHERE business_tag.tag_id = tag.id) AS popularity
+    FROM tag
+    UNION ALL
+    SELECT 'city', city, NULL, count(*)
+    FROM (SELECT trim(city) AS city FROM event UNION ALL SELECT trim(city) FROM business) AS c
+    WHERE city <> ''
+    GROUP BY city
+    """,
+    # Unique index required to refresh the view concurrently
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_autocomplete_term_kind_term "
+    "ON autocomplete_term (kind, term)",
+    "CREATE INDEX IF NOT EXISTS ix_autocomplete_term_term_trgm "
+    "ON autocomplete_term USING gin (term gin_trgm_ops)",
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_autocomplete_term(target: MetaData, connection: Any, **kwargs: Any) -> None:
+    for statement in AUTOCOMPLETE_TERM_DDL:
+        connection.execute(text(statement))
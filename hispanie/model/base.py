@@ -1,13 +1,36 @@
-from datetime import date
-from typing import Any, Type, TypeVar, overload
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from functools import cache
+from typing import Any, Callable, Iterable, Sequence, Type, TypeVar, get_args, overload
 
-from sqlalchemy import ARRAY, Date, MetaData, cast
-from sqlalchemy.orm import DeclarativeBase, Mapped
+from pydantic import BaseModel
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    DateTime,
+    MetaData,
+    Select,
+    and_,
+    bindparam,
+    event,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy import delete as sql_delete
+from sqlalchemy import update as sql_update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, joinedload, selectinload
 from sqlalchemy.orm.decl_api import DeclarativeMeta
+from sqlalchemy.orm.interfaces import ORMOption
 
 from hispanie import db
-from hispanie.errors import Error, NoDataFound
-from hispanie.utils import to_list
+from hispanie.errors import Error, Forbidden, NoDataFound
+from hispanie.utils import decode_cursor, encode_cursor, to_list
 
 T = TypeVar("T", bound="Base")
 
@@ -20,18 +43,203 @@ naming_convention = {
 }
 
 
+# Postgres extensions used by the indexes and queries of the models
+EXTENSIONS = ("cube", "earthdistance", "pg_trgm")
+
+
+# Comparison operators of the filters, passed as `<field>__<operator>=value`
+OPERATORS: dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "between": lambda column, value: column.between(*value),
+    "in": lambda column, value: column.in_(value),
+    "ilike": lambda column, value: column.ilike(value),
+    "is_null": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+
+def _nested_schema(annotation: Any) -> type[BaseModel] | None:
+    """Return the pydantic model wrapped in an annotation such as `list[Model] | None`."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        if schema := _nested_schema(arg):
+            return schema
+    return None
+
+
+@cache
+def load_options(
+    model: type["Base"],
+    schema: type[BaseModel],
+    _path: frozenset[type[BaseModel]] = frozenset(),
+) -> tuple[ORMOption, ...]:
+    """Derive the eager loading options of the relationships serialized by `schema`.
+
+    Collections are loaded with one `selectinload` query each and scalar relationships joined,
+    so serializing any number of rows costs a bounded number of queries.
+    """
+    schema.model_rebuild()
+    relationships = inspect(model).relationships
+    options = []
+    for name, field in schema.model_fields.items():
+        if name not in relationships or not (nested := _nested_schema(field.annotation)):
+            continue
+        if nested in _path:
+            continue
+        relationship = relationships[name]
+        loader = selectinload if relationship.uselist else joinedload
+        option = loader(getattr(model, name))
+        if nested_options := load_options(relationship.mapper.class_, nested, _path | {schema}):
+            option = option.options(*nested_options)
+        options.append(option)
+    return tuple(options)
+
+
 class Base(DeclarativeBase):
     __errors__: dict[str, type[Error]] = {}
+    # Unique sort key used by keyset pagination
+    __cursor__: tuple[str, ...] = ("creation_date", "id")
     metadata = MetaData(naming_convention=naming_convention)
 
     id: Mapped[str] | None
 
+    @classmethod
+    def _select(
+        cls: Type[T],
+        filter_defs: dict[str, Any] | None = None,
+        joins: list[DeclarativeMeta] | None = None,
+        options: Sequence[ORMOption] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> Select[tuple[T]]:
+        query = select(cls)
+
+        if joins:
+            for jn in joins:
+                query = query.outerjoin(jn)
+
+        if options:
+            query = query.options(*options)
+
+        if where:
+            query = query.where(*where)
+
+        for key, value in filters.items():
+            for_equality = True
+            if key.startswith("!"):
+                key = key[1:]
+                for_equality = False
+
+            key, _, operator = key.partition("__")
+            if filter_defs and key in filter_defs:
+                column = filter_defs[key]
+            else:
+                column = getattr(cls, key)
+
+            if operator:
+                if operator not in OPERATORS:
+                    raise ValueError(f"Unknown filter operator {operator}")
+                filter = OPERATORS[operator](column, value)
+            else:
+                filter = cls._equality_filter(column, value)
+
+            if for_equality:
+                query = query.where(filter)
+            else:
+                query = query.where(~filter)
+
+        if order_by or limit is not None or cursor:
+            names, descending = cls._sort_keys(order_by)
+            keys = [getattr(cls, name) for name in names]
+            if cursor:
+                values = decode_cursor(cursor)
+                if len(values) != len(keys):
+                    raise ValueError(f"Invalid cursor {cursor}")
+                values = [
+                    datetime.fromisoformat(value) if key.type.python_type is datetime else value
+                    for key, value in zip(keys, values)
+                ]
+                if descending:
+                    query = query.where(tuple_(*keys) < tuple(values))
+                else:
+                    query = query.where(tuple_(*keys) > tuple(values))
+            query = query.order_by(*(key.desc() if descending else key for key in keys))
+            query = query.limit(limit)
+
+        return query
+
+    @staticmethod
+    def _equality_filter(column: Any, value: Any) -> ColumnElement[bool]:
+        if not isinstance(value, list):
+            value = to_list(value)
+
+        if isinstance(column.type, ARRAY):
+            return column.overlap(value)
+
+        if isinstance(column.type, DateTime):
+            # A day matches the whole of it, compared as a range to stay sargable
+            days = [v for v in value if isinstance(v, date) and not isinstance(v, datetime)]
+            if days:
+                ranges = [and_(column >= day, column < day + timedelta(days=1)) for day in days]
+                if others := [v for v in value if v not in days]:
+                    ranges.append(column.in_(others))
+                return or_(*ranges)
+        return column.in_(value)
+
+    @classmethod
+    def _sort_keys(cls, order_by: Sequence[str] | None) -> tuple[list[str], bool]:
+        """Return the unique sort key of `order_by` and whether it is descending.
+
+        Fields prefixed with `-` are sorted descending, all of them sort the same way so the
+        keyset comparison holds. The primary key is appended as the tie breaker.
+        """
+        if not order_by:
+            return list(cls.__cursor__), False
+        directions = {name.startswith("-") for name in order_by}
+        if len(directions) > 1:
+            raise ValueError(f"Mixed sort directions {order_by}")
+        names = [name.lstrip("-") for name in order_by]
+        mapper = inspect(cls)
+        for name in names:
+            if name not in mapper.column_attrs:
+                raise ValueError(f"Unknown sort field {name}")
+        primary_keys = [column.key for column in mapper.primary_key]
+        names += [name for name in primary_keys if name not in names]
+        return names, directions.pop()
+
+    @classmethod
+    def _page(
+        cls: Type[T], items: list[T], limit: int, order_by: Sequence[str] | None = None
+    ) -> tuple[list[T], str | None]:
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        names, _ = cls._sort_keys(order_by)
+        return items, encode_cursor([getattr(items[-1], name) for name in names])
+
+    @classmethod
+    def _raise_not_found(cls, key: dict[str, Any]) -> None:
+        if error := cls.__errors__.get("_error"):
+            raise error(**key)
+        raise NoDataFound(key=key, messages="Not data found in DB")
+
     @overload
     @classmethod
     def find(
         cls: Type[T],
         filter_defs: dict[str, Any],
         joins: list[DeclarativeMeta],
+        options: Sequence[ORMOption] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
         **filters: Any,
     ) -> list[T]: ...
 
@@ -47,54 +255,162 @@ class Base(DeclarativeBase):
         cls: Type[T],
         filter_defs: dict[str, Any] | None = None,
         joins: list[DeclarativeMeta] | None = None,
+        options: Sequence[ORMOption] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
         **filters: Any,
     ) -> list[T]:
         with db.session_scope() as session:
-            query = session.query(cls)
+            query = cls._select(
+                filter_defs, joins, options, limit, cursor, where, order_by, **filters
+            )
+            return list(session.scalars(query).unique())
 
-            if joins:
-                for jn in joins:
-                    query = query.outerjoin(jn)
+    @classmethod
+    def paginate(
+        cls: Type[T],
+        limit: int,
+        cursor: str | None = None,
+        filter_defs: dict[str, Any] | None = None,
+        joins: list[DeclarativeMeta] | None = None,
+        options: Sequence[ORMOption] | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> tuple[list[T], str | None]:
+        """Return at most `limit` items following `cursor` and the cursor of the next page."""
+        items = cls.find(filter_defs, joins, options, limit + 1, cursor, where, order_by, **filters)
+        return cls._page(items, limit, order_by)
 
-            for_equality = True
-            for key, value in filters.items():
-                if key.startswith("!"):
-                    key = key[1:]
-                    for_equality = False
+    @classmethod
+    def get(cls: Type[T], options: Sequence[ORMOption] | None = None, **kwargs) -> T:
+        with db.session_scope() as session:
+            if not (result := session.get(cls, kwargs, options=options)):
+                cls._raise_not_found(kwargs)
+            return result
 
-                if filter_defs and key in filter_defs:
-                    column = filter_defs[key]
-                else:
-                    column = getattr(cls, key)
+    @classmethod
+    def get_many(
+        cls: Type[T], ids: Iterable[str], options: Sequence[ORMOption] | None = None
+    ) -> list[T]:
+        """Return the rows of `ids`, in that order, fetched with a single IN query."""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        with db.session_scope() as session:
+            query = select(cls).where(cls.id.in_(ids)).options(*(options or ()))
+            rows = {row.id: row for row in session.scalars(query).unique()}
+        for id in ids:
+            if id not in rows:
+                cls._raise_not_found({"id": id})
+        return [rows[id] for id in ids]
+
+    @classmethod
+    def bulk_create(cls: Type[T], rows: Iterable[dict[str, Any]]) -> list[T]:
+        """Insert `rows` with a single INSERT ... VALUES statement and return the created rows.
 
-                if not isinstance(value, list):
-                    value = to_list(value)
+        The columns missing from some of the rows get their scalar default, or NULL.
+        """
+        if not (rows := list(rows)):
+            return []
+        table = cls.__table__
+        keys = {key for row in rows for key in row}
+        defaults = {
+            key: default.arg if (default := table.c[key].default) and default.is_scalar else None
+            for key in keys
+        }
+        values = [{**defaults, **row} for row in rows]
+        with db.session_scope() as session:
+            return list(session.scalars(insert(cls).values(values).returning(cls)))
 
-                is_date = any(isinstance(v, date) for v in value)
+    @classmethod
+    def bulk_update(cls: Type[T], rows: Iterable[dict[str, Any]]) -> None:
+        """Update the rows by id, each dict holding the id and the new values of its row.
 
-                if isinstance(column.type, ARRAY):
-                    filter = column.overlap(value)
-                else:
-                    if is_date:
-                        column = cast(column, Date)
-                    filter = column.in_(value)
+        Runs one executemany UPDATE per set of updated columns. The instances of the rows loaded
+        in the session are expired, they read their new values on next access.
+        """
+        batches: dict[tuple[str, ...], list[dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            values = {key: value for key, value in row.items() if key != "id"}
+            if values:
+                batches[tuple(sorted(values))].append({"_id": row["id"], **values})
+        if not batches:
+            return
+        table = cls.__table__
+        query = sql_update(table).where(table.c.id == bindparam("_id"))
+        with db.session_scope() as session:
+            for params in batches.values():
+                session.execute(query, params)
+                for row in params:
+                    if instance := session.identity_map.get(session.identity_key(cls, row["_id"])):
+                        session.expire(instance)
 
-                if for_equality:
-                    query = query.filter(filter)
-                else:
-                    query = query.filter(~filter)
+    @classmethod
+    def bulk_delete(cls: Type[T], ids: Iterable[str]) -> int:
+        """Delete the rows of `ids` in one statement and return the number of deleted rows."""
+        if not (ids := list(ids)):
+            return 0
+        with db.session_scope() as session:
+            # Loaded instances are marked as deleted, so orphan cascades skip them
+            result = session.execute(sql_delete(cls).where(cls.id.in_(ids)))
+        return result.rowcount
+
+    @classmethod
+    def touch(cls: Type[T], *where: ColumnElement[bool]) -> int:
+        """Move the update date of the matching rows to now, for the changes of their children.
 
-            return query.all()
+        Only for `Resource` models.
+        """
+        with db.session_scope() as session:
+            result = session.execute(
+                sql_update(cls)
+                .where(*where)
+                .values(update_date=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        return result.rowcount
 
     @classmethod
-    def get(cls: Type[T], **kwargs) -> T:
+    def update_owned(cls: Type[T], id: str, owner_id: str, bypass: bool = False, **values) -> T:
+        """Update the row `id` of `owner_id`, or of anyone with `bypass`, in one round trip.
+
+        Runs `UPDATE ... WHERE id AND account_id RETURNING`, only a failed update queries the
+        row again to tell a missing row from one of another account.
+        """
+        query = sql_update(cls).where(cls.id == id).values(**values).returning(cls)
+        if not bypass:
+            query = query.where(cls.account_id == owner_id)
         with db.session_scope() as session:
-            query = session.query(cls)
-            if not (result := query.get(kwargs)):
-                if error := cls.__errors__.get("_error"):
-                    raise error(**kwargs)
-                raise NoDataFound(key=kwargs, messages="Not data found in DB")
-            return result
+            result = session.scalars(query).one_or_none()
+        if result is None:
+            cls._raise_not_owned(id)
+        return result
+
+    @classmethod
+    def delete_owned(cls: Type[T], id: str, owner_id: str, bypass: bool = False) -> T:
+        """Delete the row `id` of `owner_id`, or of anyone with `bypass`, in one round trip.
+
+        Children rows are removed by the ON DELETE CASCADE of their foreign keys.
+        """
+        query = sql_delete(cls).where(cls.id == id).returning(cls)
+        if not bypass:
+            query = query.where(cls.account_id == owner_id)
+        with db.session_scope() as session:
+            result = session.scalars(query).one_or_none()
+        if result is None:
+            cls._raise_not_owned(id)
+        return result
+
+    @classmethod
+    def _raise_not_owned(cls, id: str) -> None:
+        with db.session_scope() as session:
+            exists = session.scalar(select(cls.id).where(cls.id == id))
+        if exists:
+            raise Forbidden(id=id)
+        cls._raise_not_found({"id": id})
 
     def update(self: T, force_update: bool = False, **kwargs) -> T:
         with db.session_scope():
@@ -112,3 +428,90 @@ class Base(DeclarativeBase):
         with db.session_scope() as session:
             session.delete(self)
         return self
+
+    # asyncio variants, running on the async session of the current unit of work
+
+    @classmethod
+    async def afind(
+        cls: Type[T],
+        filter_defs: dict[str, Any] | None = None,
+        joins: list[DeclarativeMeta] | None = None,
+        options: Sequence[ORMOption] | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> list[T]:
+        """Async `find`, relationships serialized afterwards must be eager loaded via `options`."""
+        async with db.async_session_scope() as session:
+            query = cls._select(
+                filter_defs, joins, options, limit, cursor, where, order_by, **filters
+            )
+            return list((await session.scalars(query)).unique())
+
+    @classmethod
+    async def apaginate(
+        cls: Type[T],
+        limit: int,
+        cursor: str | None = None,
+        filter_defs: dict[str, Any] | None = None,
+        joins: list[DeclarativeMeta] | None = None,
+        options: Sequence[ORMOption] | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> tuple[list[T], str | None]:
+        items = await cls.afind(
+            filter_defs, joins, options, limit + 1, cursor, where, order_by, **filters
+        )
+        return cls._page(items, limit, order_by)
+
+    @classmethod
+    async def aversion(
+        cls,
+        filter_defs: dict[str, Any] | None = None,
+        joins: list[DeclarativeMeta] | None = None,
+        where: Sequence[ColumnElement[bool]] | None = None,
+        order_by: Sequence[str] | None = None,
+        **filters: Any,
+    ) -> tuple[datetime | None, int]:
+        """Return the last change date and the number of the rows matching the filters.
+
+        Validator of a list in one aggregate query: an insert or an update moves the date, a
+        delete the count. `order_by` is accepted and ignored. Only for `Resource` models.
+        """
+        last_change = func.coalesce(cls.update_date, cls.creation_date)  # type: ignore[attr-defined]
+        query = cls._select(filter_defs, joins, where=where, **filters).with_only_columns(
+            func.max(last_change), func.count(), maintain_column_froms=True
+        )
+        async with db.async_session_scope() as session:
+            last_modified, count = (await session.execute(query)).one()
+        return last_modified, count
+
+    @classmethod
+    async def aget(cls: Type[T], options: Sequence[ORMOption] | None = None, **kwargs) -> T:
+        async with db.async_session_scope() as session:
+            if not (result := await session.get(cls, kwargs, options=options)):
+                cls._raise_not_found(kwargs)
+            return result
+
+    async def aupdate(self: T, force_update: bool = False, **kwargs) -> T:
+        async with db.async_session_scope() as session:
+            for key, value in kwargs.items():
+                if force_update or value is not None:
+                    setattr(self, key, value)
+        await self._arefresh_expired(session)
+        return self
+
+    async def _arefresh_expired(self: T, session: AsyncSession) -> None:
+        # Server side values (creation_date, update_date) are expired by the flush and cannot be
+        # lazy loaded later on from an async session
+        if expired := inspect(self).expired_attributes:
+            await session.refresh(self, attribute_names=list(expired))
+
+
+@event.listens_for(Base.metadata, "before_create")
+def _create_extensions(target: MetaData, connection: Any, **kwargs: Any) -> None:
+    for name in EXTENSIONS:
+        connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {name}"))
@@ -2,7 +2,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Enum as SQLAEnum
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..errors import NoBusinessFound
@@ -30,6 +30,17 @@ class BusinessCategory(Enum):
 class Business(Base, Entity):
     __tablename__ = "business"
     __errors__ = {"_error": NoBusinessFound}
+    __table_args__ = (
+        Index(
+            "ix_business_earth_location",
+            text("ll_to_earth(latitude, longitude)"),
+            postgresql_using="gist",
+        ),
+        Index("ix_business_point", text("point(longitude, latitude)"), postgresql_using="gist"),
+        Index("ix_business_search_vector", "search_vector", postgresql_using="gin"),
+        # Default sort key of the pages
+        Index("ix_business_creation_date_id", "creation_date", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: idun("business"))
 
@@ -43,7 +54,7 @@ class Business(Base, Entity):
 
     # foreign key
 
-    account_id: Mapped[str] = mapped_column(ForeignKey("account.id"), nullable=False)
+    account_id: Mapped[str] = mapped_column(ForeignKey("account.id"), nullable=False, index=True)
 
     # relationships
 
@@ -51,12 +62,15 @@ class Business(Base, Entity):
     account: Mapped["Account"] = relationship("Account", back_populates="businesses")
 
     social_networks: Mapped[list["SocialNetwork"]] = relationship(
-        "SocialNetwork", back_populates="business", cascade="all, delete-orphan"
+        "SocialNetwork",
+        back_populates="business",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     # Many-to-Many relationship with File
     files: Mapped[list["File"]] = relationship(
-        "File", back_populates="business", cascade="all, delete-orphan"
+        "File", back_populates="business", cascade="all, delete-orphan", passive_deletes=True
     )
 
     # Many-to-Many relationship with Tag
@@ -9,6 +9,8 @@ from .resource import Resource
 class BusinessTag(Base, Resource):
     __tablename__ = "business_tag"
 
-    business_id: Mapped[str] = mapped_column(ForeignKey("business.id"), primary_key=True)
+    business_id: Mapped[str] = mapped_column(
+        ForeignKey("business.id", ondelete="CASCADE"), primary_key=True
+    )
 
-    tag_id: Mapped[str] = mapped_column(ForeignKey("tag.id"), primary_key=True)
+    tag_id: Mapped[str] = mapped_column(ForeignKey("tag.id"), primary_key=True, index=True)
@@ -1,8 +1,16 @@
-from sqlalchemy import Boolean, Float, String
+from typing import Any, Sequence, Type, TypeVar
+
+from sqlalchemy import Boolean, ColumnElement, Float, String, func, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm.interfaces import ORMOption
+
+from hispanie import db
 
 from .resource import Resource
 
+E = TypeVar("E", bound="Entity")
+
 
 class Entity(Resource):
     """Entity model for managing geographical and contact information."""
@@ -27,6 +35,43 @@ class Entity(Resource):
     # Visibility
     is_public: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
+    # Full text search document, maintained by the action layer on write
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, deferred=True)
+
     # DONE email
     # DONE phone number
     # DONE Add countty, municipality, postcode, region
+
+    @classmethod
+    def earth_location(cls) -> ColumnElement[Any]:
+        """Position as an earthdistance cube, the expression of the GiST index of the tables."""
+        return func.ll_to_earth(cls.latitude, cls.longitude)
+
+    @classmethod
+    async def anearby(
+        cls: Type[E],
+        latitude: float,
+        longitude: float,
+        radius: float,
+        limit: int,
+        options: Sequence[ORMOption] | None = None,
+    ) -> list[tuple[E, float]]:
+        """Return the `limit` closest entities within `radius` meters with their distance.
+
+        The bounding box filter and the k-NN ordering are both served by the GiST index.
+        """
+        origin = func.ll_to_earth(latitude, longitude)
+        location = cls.earth_location()
+        distance = func.earth_distance(location, origin)
+        query = (
+            select(cls, distance.label("distance"))
+            .where(func.earth_box(origin, radius).op("@>")(location), distance <= radius)
+            .order_by(location.op("<->")(origin))
+            .limit(limit)
+        )
+        if options:
+            query = query.options(*options)
+        async with db.async_session_scope() as session:
+            return [
+                (entity, distance) for entity, distance in (await session.execute(query)).unique()
+            ]
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, text
 from sqlalchemy import Enum as SQLAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -42,12 +42,33 @@ class EventFrequency(Enum):
 class Event(Base, Entity):
     __tablename__ = "event"
     __errors__ = {"_error": NoEventFound}
+    __cursor__ = ("start_date", "id")
+    __table_args__ = (
+        Index(
+            "ix_event_earth_location",
+            text("ll_to_earth(latitude, longitude)"),
+            postgresql_using="gist",
+        ),
+        Index("ix_event_point", text("point(longitude, latitude)"), postgresql_using="gist"),
+        Index("ix_event_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_event_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index("ix_event_is_public_start_date", "is_public", "start_date"),
+        # Only the recurring events are looked up by frequency, enum names are stored
+        Index("ix_event_frequency", "frequency", postgresql_where=text("frequency <> 'NONE'")),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: idun("event"))
 
     category: Mapped[EventCategory] = mapped_column(SQLAEnum(EventCategory), nullable=False)
 
-    start_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    start_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
 
     end_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
@@ -65,7 +86,7 @@ class Event(Base, Entity):
 
     # foreign key
 
-    account_id: Mapped[str] = mapped_column(ForeignKey("account.id"), nullable=False)
+    account_id: Mapped[str] = mapped_column(ForeignKey("account.id"), nullable=False, index=True)
 
     # relationships
 
@@ -73,15 +94,15 @@ class Event(Base, Entity):
     account: Mapped["Account"] = relationship("Account", back_populates="events")
 
     activities: Mapped[list["Activity"]] = relationship(
-        "Activity", back_populates="event", cascade="all, delete-orphan"
+        "Activity", back_populates="event", cascade="all, delete-orphan", passive_deletes=True
     )
 
     files: Mapped[list["File"]] = relationship(
-        "File", back_populates="event", cascade="all, delete-orphan"
+        "File", back_populates="event", cascade="all, delete-orphan", passive_deletes=True
     )
 
     tickets: Mapped[list["Ticket"]] = relationship(
-        "Ticket", back_populates="event", cascade="all, delete-orphan"
+        "Ticket", back_populates="event", cascade="all, delete-orphan", passive_deletes=True
     )
 
     # Many-to-Many relationships
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+if TYPE_CHECKING:
+    from .event import Event
+
+
+class EventOccurrence(Base):
+    """Dated instance of an event, materialized from its frequency over a rolling horizon."""
+
+    __tablename__ = "event_occurrence"
+    __cursor__ = ("start_date", "event_id")
+    # Range queries on the calendar are served by a single scan of this index in cursor order
+    __table_args__ = (Index("ix_event_occurrence_start_date", "start_date", "event_id"),)
+
+    event_id: Mapped[str] = mapped_column(
+        ForeignKey("event.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    start_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    end_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    # relationships
+
+    event: Mapped["Event"] = relationship("Event")
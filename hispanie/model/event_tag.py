@@ -9,6 +9,8 @@ from .resource import Resource
 class EventTag(Base, Resource):
     __tablename__ = "event_tag"
 
-    event_id: Mapped[str] = mapped_column(ForeignKey("event.id"), primary_key=True)
+    event_id: Mapped[str] = mapped_column(
+        ForeignKey("event.id", ondelete="CASCADE"), primary_key=True
+    )
 
-    tag_id: Mapped[str] = mapped_column(ForeignKey("tag.id"), primary_key=True)
+    tag_id: Mapped[str] = mapped_column(ForeignKey("tag.id"), primary_key=True, index=True)
@@ -2,7 +2,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Enum as SQLAEnum
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..utils import idun
@@ -22,6 +22,8 @@ class FileCategory(Enum):
 
 class File(Base, Resource):
     __tablename__ = "file"
+    # Default sort key of the pages
+    __table_args__ = (Index("ix_file_creation_date_id", "creation_date", "id"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: idun("file"))
 
@@ -36,11 +38,15 @@ class File(Base, Resource):
     hash: Mapped[str] = mapped_column(String, nullable=False)
 
     # foreign key
-    account_id: Mapped[str | None] = mapped_column(ForeignKey("account.id"))
+    account_id: Mapped[str | None] = mapped_column(ForeignKey("account.id"), index=True)
 
-    event_id: Mapped[str | None] = mapped_column(ForeignKey("event.id"))
+    event_id: Mapped[str | None] = mapped_column(
+        ForeignKey("event.id", ondelete="CASCADE"), index=True
+    )
 
-    business_id: Mapped[str | None] = mapped_column(ForeignKey("business.id"))
+    business_id: Mapped[str | None] = mapped_column(
+        ForeignKey("business.id", ondelete="CASCADE"), index=True
+    )
 
     # relationship
 
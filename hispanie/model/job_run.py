@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .resource import Resource
+
+
+class JobRun(Base, Resource):
+    """Bookkeeping of the last run of a scheduled job, shared by every worker and replica."""
+
+    __tablename__ = "job_run"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)  # job name
+
+    last_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    last_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    last_duration: Mapped[float] = mapped_column(Float, nullable=False)  # seconds
+
+    last_status: Mapped[str] = mapped_column(String, nullable=False)
+
+    last_error: Mapped[str | None] = mapped_column(String)
+
+    runs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
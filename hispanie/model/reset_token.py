@@ -18,7 +18,7 @@ class ResetToken(Base, Resource):
     used: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # foreign key
-    account_id: Mapped[str] = mapped_column(ForeignKey("account.id"))
+    account_id: Mapped[str] = mapped_column(ForeignKey("account.id"), index=True)
 
     # relationship
 
@@ -32,7 +32,9 @@ class SocialNetwork(Base, Resource):
     )
 
     # foreign key
-    business_id: Mapped[str] = mapped_column(ForeignKey("business.id"))
+    business_id: Mapped[str] = mapped_column(
+        ForeignKey("business.id", ondelete="CASCADE"), index=True
+    )
 
     # relationship
 
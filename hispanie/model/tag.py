@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..errors import NoTagFound
@@ -12,6 +12,8 @@ from .resource import Resource
 class Tag(Base, Resource):
     __tablename__ = "tag"
     __errors__ = {"_error": NoTagFound}
+    # Default sort key of the pages
+    __table_args__ = (Index("ix_tag_creation_date_id", "creation_date", "id"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: idun("tag"))
 
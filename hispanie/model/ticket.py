@@ -33,7 +33,7 @@ class Ticket(Base, Resource):
 
     currency: Mapped[Currency] = mapped_column(nullable=False)
 
-    event_id: Mapped[str] = mapped_column(ForeignKey("event.id"))
+    event_id: Mapped[str] = mapped_column(ForeignKey("event.id", ondelete="CASCADE"))
 
     __table_args__ = (UniqueConstraint("event_id", "name", name="unique_ticket_name_for_event"),)
 
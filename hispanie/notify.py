@@ -0,0 +1,116 @@
+import asyncio
+import json
+import secrets
+from typing import Any, Callable
+
+import asyncpg
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, SessionTransaction
+
+from .config import Config, logging
+from .db import transaction
+from .metrics import Counter, register
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "hispanie_changes"
+
+# Id of a change touching every row of the entity
+ALL = "*"
+
+# Identifies this process in the notifications, its own ones are already handled locally
+ORIGIN = secrets.token_hex(8)
+
+_handlers: dict[str, list[Callable[[str], Any]]] = {}
+
+published = Counter()
+received = Counter()
+
+
+def register_handler(entity: str, handler: Callable[[str], Any]) -> None:
+    """Call `handler` with the id of every changed `entity`, whatever the worker writing it."""
+    _handlers.setdefault(entity, []).append(handler)
+
+
+def dispatch(entity: str, id: str) -> None:
+    for handler in _handlers.get(entity, []):
+        try:
+            handler(id)
+        except Exception:
+            logger.exception("Unable to handle the change of %s %s", entity, id)
+
+
+def publish(entity: str, id: str = ALL) -> None:
+    """Notify the change of `entity` `id` with the transaction writing it.
+
+    Called inside the transaction of the write, Postgres delivers the notification to the other
+    workers when it commits and this worker handles the change once committed. Nothing is
+    notified when it rolls back.
+    """
+    payload = json.dumps({"entity": entity, "id": id, "origin": ORIGIN})
+    with transaction() as session:
+        session.execute(select(func.pg_notify(CHANNEL, payload)))
+        session.info.setdefault("published", []).append((entity, id))
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_published(session: Session) -> None:
+    for entity, id in session.info.pop("published", []):
+        published.inc()
+        dispatch(entity, id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_published(session: Session, previous_transaction: SessionTransaction) -> None:
+    # A savepoint rolling back leaves the changes of the enclosing transaction to notify
+    if previous_transaction.parent is None:
+        session.info.pop("published", None)
+
+
+def _on_notification(_connection: Any, _pid: int, _channel: str, payload: str) -> None:
+    change = json.loads(payload)
+    if change["origin"] == ORIGIN:
+        return
+    received.inc()
+    dispatch(change["entity"], change["id"])
+
+
+async def run_listener(keepalive_interval: float = 30) -> None:
+    """Listen to the changes of the other workers forever, reconnecting on failure.
+
+    The changes notified while disconnected are lost, every entity is invalidated on connection.
+    """
+    db = Config.database
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(
+                host=db.host,
+                port=int(db.port),
+                user=db.user,
+                password=db.password,
+                database=db.database,
+            )
+            await connection.add_listener(CHANNEL, _on_notification)
+            logger.info("Listening to %s", CHANNEL)
+            for entity in _handlers:
+                dispatch(entity, ALL)
+            while True:
+                await asyncio.sleep(keepalive_interval)
+                # Detects a dead connection, notifications are delivered between queries
+                await connection.execute("select 1")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Lost the connection listening to %s", CHANNEL)
+        finally:
+            if connection is not None:
+                connection.terminate()
+        await asyncio.sleep(keepalive_interval)
+
+
+def notify_metrics() -> dict[str, int]:
+    return {"published": published.value, "received": received.value}
+
+
+register("notifications", notify_metrics)
@@ -0,0 +1,46 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .config import Config, logging
+from .errors import PasswordWorkersBusy
+from .utils import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# bcrypt releases the GIL, a thread pool keeps the event loop free while hashing
+_executor = ThreadPoolExecutor(
+    max_workers=int(Config.security.password_workers), thread_name_prefix="password"
+)
+# Operations running or waiting for a worker, the rest are rejected
+_slots = asyncio.Semaphore(
+    int(Config.security.password_workers) + int(Config.security.password_queue_size)
+)
+
+
+async def _run(func: Callable[..., R], *args: Any) -> R:
+    if _slots.locked():
+        logger.warning("Password workers queue is full")
+        raise PasswordWorkersBusy()
+    async with _slots:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+
+def hash_password(password: str) -> bytes:
+    return generate_password_hash(password, int(Config.security.bcrypt_rounds))
+
+
+def needs_rehash(hashed_password: bytes) -> bool:
+    """Whether the hash was computed with another cost than the configured one."""
+    # bcrypt hashes look like $2b$<cost>$<salt and checksum>
+    return int(hashed_password.split(b"$")[2]) != int(Config.security.bcrypt_rounds)
+
+
+async def ahash_password(password: str) -> bytes:
+    return await _run(hash_password, password)
+
+
+async def acheck_password(hashed_password: bytes, password: str) -> bool:
+    return await _run(check_password_hash, hashed_password, password)
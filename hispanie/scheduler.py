@@ -0,0 +1,109 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+
+from sqlalchemy import func, select
+
+from .config import Config, logging
+from .db import get_engine, unit_of_work
+from .metrics import register
+from .model import JobRun
+
+logger = logging.getLogger(__name__)
+
+# First key of the advisory locks taken by the scheduler, the second one is the job name hash
+ADVISORY_LOCK_NAMESPACE = 7_402_311
+
+
+@dataclass
+class Job:
+    name: str
+    target: Callable[[], Any]
+    interval: timedelta
+    last_duration: float | None = None
+    last_status: str | None = None
+
+
+_jobs: dict[str, Job] = {}
+
+
+def register_job(name: str, target: Callable[[], Any], interval: timedelta) -> Job:
+    """Register `target` to be run every `interval` by a single worker of the whole deployment."""
+    job = _jobs[name] = Job(name=name, target=target, interval=interval)
+    return job
+
+
+def run_if_due(job: Job) -> bool:
+    """Run the job if no other worker holds it and its interval elapsed since the last run.
+
+    Blocking, meant to be called from a worker thread.
+    """
+    lock_key = (ADVISORY_LOCK_NAMESPACE, func.hashtext(job.name))
+    with get_engine(Config.database).connect() as conn:
+        if not conn.execute(select(func.pg_try_advisory_lock(*lock_key))).scalar():
+            logger.debug("Job %s is running in another worker", job.name)
+            return False
+        # Session level lock, it survives the end of this transaction
+        conn.commit()
+        try:
+            with unit_of_work():
+                return _run(job)
+        finally:
+            conn.execute(select(func.pg_advisory_unlock(*lock_key)))
+            conn.commit()
+
+
+def _run(job: Job) -> bool:
+    now = datetime.now(timezone.utc)
+    last_runs = JobRun.find(id=job.name)
+    if last_runs and last_runs[0].last_start + job.interval > now:
+        return False
+
+    logger.info("Running job %s", job.name)
+    start = time.perf_counter()
+    status, error = "succeeded", None
+    try:
+        job.target()
+    except Exception as e:
+        logger.exception("Job %s failed", job.name)
+        status, error = "failed", str(e)
+    duration = time.perf_counter() - start
+    job.last_duration, job.last_status = duration, status
+
+    values = {
+        "last_start": now,
+        "last_end": datetime.now(timezone.utc),
+        "last_duration": duration,
+        "last_status": status,
+        "last_error": error,
+    }
+    if last_runs:
+        last_runs[0].update(force_update=True, runs=last_runs[0].runs + 1, **values)
+    else:
+        JobRun(id=job.name, runs=1, **values).create()
+    logger.info("Job %s %s in %.3fs", job.name, status, duration)
+    return True
+
+
+async def run_scheduler(poll_interval: float = 60) -> None:
+    """Check the registered jobs forever, running the due ones off the event loop."""
+    logger.info("Starting scheduler with jobs %s", list(_jobs))
+    while True:
+        for job in list(_jobs.values()):
+            try:
+                await asyncio.to_thread(run_if_due, job)
+            except Exception:
+                logger.exception("Unable to run job %s", job.name)
+        await asyncio.sleep(poll_interval)
+
+
+def scheduler_metrics() -> dict[str, dict[str, Any]]:
+    return {
+        job.name: {"last_duration": job.last_duration, "last_status": job.last_status}
+        for job in _jobs.values()
+    }
+
+
+register("scheduler", scheduler_metrics)
@@ -1,5 +1,6 @@
 from .account import (
     AccountCreateRequest,
+    AccountPrincipal,
     AccountResponse,
     AccountUpdateRequest,
     ForgotPasswordRequest,
@@ -12,28 +13,54 @@ from .activity import (
     ActivityResponse,
     ActivityUpdateRequest,
 )
-from .business import BusinessCreateRequest, BusinessResponse, BusinessUpdateRequest
-from .event import EventCreateRequest, EventResponse, EventUpdateRequest
+from .autocomplete import AutocompleteResponse
+from .business import (
+    BusinessCreateRequest,
+    BusinessFilterParams,
+    BusinessNearbyResponse,
+    BusinessResponse,
+    BusinessUpdateRequest,
+)
+from .event import (
+    EventCreateRequest,
+    EventFilterParams,
+    EventNearbyResponse,
+    EventOccurrenceResponse,
+    EventResponse,
+    EventUpdateRequest,
+)
 from .file import (
     FileCreateRequest,
     FileGeneratePresignedUrlResponse,
     FileResponse,
     FileUpdateRequest,
 )
+from .map import ClusterCategoryResponse, ClusterResponse
+from .page import Page, PageParams
+from .search import SearchHitResponse
 from .tag import TagBasicResponse, TagCreateRequest, TagResponse, TagUpdateRequest
 from .ticket import TicketCreateRequest, TicketResponse, TicketUpdateRequest
 
 __all__ = [
     "AccountCreateRequest",
+    "AccountPrincipal",
     "AccountResponse",
     "AccountUpdateRequest",
     "ActivityCreateRequest",
     "ActivityResponse",
     "ActivityUpdateRequest",
+    "AutocompleteResponse",
     "BusinessCreateRequest",
+    "BusinessFilterParams",
+    "BusinessNearbyResponse",
     "BusinessResponse",
     "BusinessUpdateRequest",
+    "ClusterCategoryResponse",
+    "ClusterResponse",
     "EventCreateRequest",
+    "EventFilterParams",
+    "EventNearbyResponse",
+    "EventOccurrenceResponse",
     "EventResponse",
     "EventUpdateRequest",
     "FileCreateRequest",
@@ -41,7 +68,10 @@ __all__ = [
     "ForgotPasswordRequest",
     "FileResponse",
     "FileUpdateRequest",
+    "Page",
+    "PageParams",
     "ResetPasswordRequest",
+    "SearchHitResponse",
     "TagBasicResponse",
     "TagCreateRequest",
     "TagResponse",
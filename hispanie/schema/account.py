@@ -51,6 +51,16 @@ class AccountUpdateRequest(BaseModel):
     )
 
 
+class AccountPrincipal(BaseModel):
+    """Lightweight snapshot of the authenticated account."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: str
+    username: str
+    type: AccountType
+
+
 # Schema for Account Response
 class AccountResponse(BaseModel):
     """Schema for returning Account data."""
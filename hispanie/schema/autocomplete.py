@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+
+class AutocompleteResponse(BaseModel):
+    """Schema for returning a typeahead suggestion."""
+
+    value: str
+    id: str | None = Field(None, description="Id of the suggested tag or event")
+    popularity: int | None = Field(None, description="Number of events and businesses using it")
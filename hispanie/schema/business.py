@@ -1,7 +1,11 @@
+from typing import Any, Literal
+
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from ..model import BusinessCategory
 from ..typing import CustomDateTime
+from ..utils import escape_like
+from .page import PageParams
 
 
 class BusinessCreateRequest(BaseModel):
@@ -98,6 +102,34 @@ class BusinessResponse(BaseModel):
     update_date: CustomDateTime | None
 
 
+class BusinessFilterParams(PageParams):
+    """Query parameters filtering and sorting the Business lists."""
+
+    category: list[BusinessCategory] | None = None
+    is_public: bool | None = None
+    city: str | None = Field(None, description="City, case insensitive")
+    name: str | None = Field(None, description="Part of the name, case insensitive")
+    order_by: Literal["creation_date", "-creation_date", "name", "-name"] = "creation_date"
+
+    def filters(self) -> dict[str, Any]:
+        """Return the filters of `Base.find`, omitting the unset parameters."""
+        filters = {
+            "category": self.category,
+            "is_public": self.is_public,
+            "city__ilike": escape_like(self.city),
+            "name__ilike": f"%{escape_like(self.name)}%" if self.name else None,
+        }
+        filters = {key: value for key, value in filters.items() if value is not None}
+        return {**filters, "order_by": [self.order_by]}
+
+
+class BusinessNearbyResponse(BaseModel):
+    """Schema for returning a Business with its distance to the searched point."""
+
+    business: BusinessResponse
+    distance: float = Field(..., description="Distance in meters")
+
+
 from .file import FileBasicResponse, FileCreateRequest, FileUpdateRequest  # noqa: E402
 from .social_network import (  # noqa: E402
     SocialNetworkBasicResponse,
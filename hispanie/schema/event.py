@@ -1,9 +1,12 @@
 from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from ..model import EventCategory, EventFrequency
 from ..typing import CustomDateTime
+from ..utils import escape_like
+from .page import PageParams
 
 
 class EventCreateRequest(BaseModel):
@@ -117,6 +120,52 @@ class EventResponse(BaseModel):
     update_date: CustomDateTime | None
 
 
+class EventFilterParams(PageParams):
+    """Query parameters filtering and sorting the Event lists."""
+
+    category: list[EventCategory] | None = None
+    frequency: list[EventFrequency] | None = None
+    is_public: bool | None = None
+    city: str | None = Field(None, description="City, case insensitive")
+    name: str | None = Field(None, description="Part of the name, case insensitive")
+    start_date_gte: datetime | None = Field(None, description="Starting at or after")
+    start_date_lt: datetime | None = Field(None, description="Starting before")
+    end_date_gte: datetime | None = Field(None, description="Ending at or after")
+    order_by: Literal["start_date", "-start_date", "name", "-name"] = "start_date"
+
+    def filters(self) -> dict[str, Any]:
+        """Return the filters of `Base.find`, omitting the unset parameters."""
+        filters = {
+            "category": self.category,
+            "frequency": self.frequency,
+            "is_public": self.is_public,
+            "city__ilike": escape_like(self.city),
+            "name__ilike": f"%{escape_like(self.name)}%" if self.name else None,
+            "start_date__gte": self.start_date_gte,
+            "start_date__lt": self.start_date_lt,
+            "end_date__gte": self.end_date_gte,
+        }
+        filters = {key: value for key, value in filters.items() if value is not None}
+        return {**filters, "order_by": [self.order_by]}
+
+
+class EventOccurrenceResponse(BaseModel):
+    """Schema for returning an occurrence of an Event in the calendar."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    start_date: CustomDateTime
+    end_date: CustomDateTime
+    event: EventResponse
+
+
+class EventNearbyResponse(BaseModel):
+    """Schema for returning an Event with its distance to the searched point."""
+
+    event: EventResponse
+    distance: float = Field(..., description="Distance in meters")
+
+
 from .activity import (  # noqa: E402
     ActivityCreateRequest,
     ActivityResponse,
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+
+
+class ClusterCategoryResponse(BaseModel):
+    """Schema for returning the number of points of a category in a cluster."""
+
+    category: str
+    count: int
+
+
+class ClusterResponse(BaseModel):
+    """Schema for returning a cluster of events and businesses of the map."""
+
+    latitude: float = Field(..., description="Latitude of the centroid")
+    longitude: float = Field(..., description="Longitude of the centroid")
+    count: int
+    events: int
+    businesses: int
+    top_categories: list[ClusterCategoryResponse]
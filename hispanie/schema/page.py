@@ -0,0 +1,23 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+from ..typing import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Schema for returning a page of a list endpoint."""
+
+    items: list[T]
+    next_cursor: str | None = Field(None, description="Cursor of the next page, null on the last")
+
+
+class PageParams(BaseModel):
+    """Query parameters of a list endpoint page, for query parameter models."""
+
+    limit: int = Field(
+        DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items returned"
+    )
+    cursor: str | None = Field(None, description="`next_cursor` of the previous page")
@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from .business import BusinessResponse
+from .event import EventResponse
+
+
+class SearchHitResponse(BaseModel):
+    """Schema for returning a full text search hit, either an event or a business."""
+
+    kind: Literal["event", "business"]
+    rank: float = Field(..., description="Relevance of the hit, higher first")
+    event: EventResponse | None = None
+    business: BusinessResponse | None = None
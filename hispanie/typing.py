@@ -1,9 +1,26 @@
 from datetime import datetime
 
+from fastapi import Query
 from pydantic import PlainSerializer
 from typing_extensions import Annotated
 
+# Same text as strftime("%Y-%m-%d %H:%M:%S"), isoformat does not parse a format string
 CustomDateTime = Annotated[
     datetime,
-    PlainSerializer(lambda _datetime: _datetime.strftime("%Y-%m-%d %H:%M:%S"), return_type=str),
+    PlainSerializer(lambda _datetime: _datetime.isoformat(" ", "seconds")[:19], return_type=str),
 ]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+PageLimit = Annotated[
+    int, Query(ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items returned")
+]
+PageCursor = Annotated[str | None, Query(description="`next_cursor` of the previous page")]
+
+DEFAULT_RADIUS = 5_000  # meters
+MAX_RADIUS = 100_000
+
+Latitude = Annotated[float, Query(ge=-90.0, le=90.0, description="Latitude in decimal degrees")]
+Longitude = Annotated[float, Query(ge=-180.0, le=180.0, description="Longitude in decimal degrees")]
+Radius = Annotated[float, Query(gt=0, le=MAX_RADIUS, description="Search radius in meters")]
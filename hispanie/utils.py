@@ -1,7 +1,12 @@
+import base64
+import json
 import secrets
+import threading
+import time
 from collections import defaultdict
 from dataclasses import fields
-from typing import TYPE_CHECKING, Any, Optional, Type, TypeVar
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Type, TypeVar
 
 import bcrypt
 from apischema import deserialize
@@ -15,6 +20,9 @@ if TYPE_CHECKING:
 
 _config_fields: dict[Type, Optional[Any]] = {}
 
+_uuid7_lock = threading.Lock()
+_uuid7_state = (0, 0)  # last milliseconds and counter
+
 Cls = TypeVar("Cls", bound=Type)
 
 TOKEN_KEY_NAME = "access_token"
@@ -79,12 +87,36 @@ def load_configuration_data(config: dict[str, Any]) -> None:
         _config_fields[key] = deserialize(key, config)
 
 
-def idun(prefix: str, nbytes: int = 16) -> str:
-    return f"{prefix}-{secrets.token_hex(nbytes)}"
+def uuid7_hex() -> str:
+    """Return a UUIDv7 as 32 hex digits, increasing with time in string order.
+
+    48 bits of unix milliseconds, the version, a 12 bits counter keeping the ids generated in the
+    same millisecond ordered, the variant and 62 random bits.
+    """
+    global _uuid7_state
+    with _uuid7_lock:
+        last_ms, counter = _uuid7_state
+        ms = time.time_ns() // 1_000_000
+        if ms > last_ms:
+            # Random start leaving room for the ids of the same millisecond
+            counter = secrets.randbits(11)
+        else:
+            # Same millisecond or clock moved backwards, carry on from the last id
+            ms, counter = last_ms, counter + 1
+            if counter > 0xFFF:
+                ms, counter = ms + 1, 0
+        _uuid7_state = (ms, counter)
+    value = (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | secrets.randbits(62)
+    return f"{value:032x}"
+
+
+def idun(prefix: str) -> str:
+    """Return a `<prefix>-<32 hex>` id, time ordered so inserts stay at the right of the indexes."""
+    return f"{prefix}-{uuid7_hex()}"
 
 
-def generate_password_hash(password: str) -> bytes:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+def generate_password_hash(password: str, rounds: int = 12) -> bytes:
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds))
 
 
 def check_password_hash(hashed_password: bytes, input_password: str) -> bool:
@@ -98,24 +130,25 @@ def ensure_user_owns_resource(current_account_id: str, resource_owner_id: str) -
         raise Exception("You do not have permission to access this resource.")
 
 
-def handle_update_files(files: list[dict[str, Any]], model: Type["T"]) -> list["T"]:
+def handle_update_files(files: list[dict[str, Any]], model: Type["T"], **parent: Any) -> list["T"]:
     categories = defaultdict(list)
     for item in files:
         categories[item["category"]].append(item)
 
     filtered_data = []
+    ids_to_delete, ids_to_keep = [], []
     for _, items in categories.items():
         without_id = [item for item in items if "id" not in item]
-        with_id = [item for item in items if "id" in item]
+        with_id = [item["id"] for item in items if "id" in item]
 
         if without_id:
-            filtered_data.append(model(**without_id[-1]))
-            if with_id:
-                [model.get(id=f["id"]).delete() for f in with_id]
+            filtered_data.append({**without_id[-1], **parent})
+            ids_to_delete.extend(with_id)
         else:
-            filtered_data.extend([model.get(id=f["id"]) for f in with_id])
+            ids_to_keep.extend(with_id)
 
-    return filtered_data
+    model.bulk_delete(ids_to_delete)
+    return model.bulk_create(filtered_data) + model.get_many(ids_to_keep)
 
 
 def handle_update_resources(
@@ -124,23 +157,35 @@ def handle_update_resources(
     model: Type["T"],
     remove_duplicates: bool = False,
     key_duplicates: str = "name",
+    **parent: Any,
 ) -> list["T"]:
-    old_resource_ids = {sn.id for sn in old_resources}
-    new_resource_ids = {sn["id"] for sn in new_resources if "id" in sn}
-
-    resource_ids_to_delete = old_resource_ids - new_resource_ids
-    resource_ids_to_create = [sn for sn in new_resources if "id" not in sn]
-
-    [model.get(id=id).delete() for id in resource_ids_to_delete]
-
-    result = [model(**sn) for sn in resource_ids_to_create] + [
-        model.get(id=id) for id in new_resource_ids
-    ]
-
-    if result and remove_duplicates:
-        return delete_duplicates(result, key_duplicates)
-
-    return result
+    """Apply the nested resources of an update request to the current ones of their parent.
+
+    The resources left out are deleted, the ones with an id updated and the others created with
+    the `parent` foreign key, one statement each.
+    """
+    old_resources_by_id = {sn.id: sn for sn in old_resources}
+    resources_to_update = [sn for sn in new_resources if "id" in sn]
+    resources_to_create = [sn for sn in new_resources if "id" not in sn]
+    new_resource_ids = [sn["id"] for sn in resources_to_update]
+
+    if remove_duplicates:
+        # The updated resources win over the created ones with the same key
+        keys = {
+            sn.get(key_duplicates, getattr(old_resources_by_id.get(sn["id"]), key_duplicates, None))
+            for sn in resources_to_update
+        }
+        resources_to_create = [
+            sn
+            for sn in delete_duplicates(resources_to_create, key_duplicates)
+            if sn[key_duplicates] not in keys
+        ]
+
+    model.bulk_delete(old_resources_by_id.keys() - set(new_resource_ids))
+    # Only the resources of this parent are updated
+    model.bulk_update(sn for sn in resources_to_update if sn["id"] in old_resources_by_id)
+    created = model.bulk_create({**sn, **parent} for sn in resources_to_create)
+    return created + model.get_many(new_resource_ids)
 
 
 def delete_duplicates(list_objects: list, key: str) -> list:
@@ -154,6 +199,26 @@ def delete_duplicates(list_objects: list, key: str) -> list:
     return list(uniques.values())
 
 
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last item of a page as an opaque cursor."""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise ValueError(f"Invalid cursor {cursor}") from None
+
+
+def escape_like(value: str | None) -> str | None:
+    """Escape the wildcards of a LIKE pattern, with the default backslash escape character."""
+    if value is None:
+        return None
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def to_list(value: Any) -> list[Any]:
     if value is None:
         return []
@@ -7,17 +7,17 @@ VERSION = "0.1"
 INSTALL_REQUIRES = [
     "alembic>=1.14.0",
     "apischema>=0.19.0",
+    "asyncpg>=0.30.0",
     "asyncio>=3.4.3",
     "bcrypt>=4.2.1",
     "boto3>=1.36.13",
     "fastapi[all]>=0.115.5",
     "fastapi_mail>=1.4.2",
-    "fastapi-utils[all]>=0.8.0",
     "itsdangerous>=2.2.0",
     "psycopg2-binary>=2.9.10",
     "python-jose[cryptography]==3.3.0",
     # "python-telegram-bot==20.0a2",
-    "SQLAlchemy>=2.0.36",
+    "SQLAlchemy[asyncio]>=2.0.36",
 ]
 
 setup(
@@ -29,7 +29,11 @@ setup(
     author_email="daniel14015@gmail.com",
     description="Backend for hispanie app",
     include_package_data=True,
-    entry_points={"console_scripts": []},
+    entry_points={
+        "console_scripts": [
+            "hispanie-reindex-search=hispanie.action.search:reindex_search_vectors",
+        ]
+    },
     install_requires=INSTALL_REQUIRES,
     extras_require={
         "dev": [
@@ -0,0 +1,115 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from hispanie.action import acached_page, create_tag, invalidate_responses
+from hispanie.action.cache import response_cache
+from hispanie.cache import SingleFlight
+from hispanie.schema import TagCreateRequest, TagResponse
+
+PARAMS = {"limit": 20}
+
+
+@pytest.fixture(autouse=True)
+def clock():
+    """Monotonic clock of the caches, moved forward by hand."""
+    now = [1000.0]
+    # The module of the caches only, the event loop keeps the real clock
+    with mock.patch("hispanie.cache.time", mock.Mock(monotonic=lambda: now[0])):
+        invalidate_responses()
+        yield now
+    invalidate_responses()
+
+
+@pytest.fixture
+def produce():
+    return mock.AsyncMock(return_value=([], None))
+
+
+def read_page(produce) -> bytes:
+    return asyncio.run(acached_page("tags.public.read", PARAMS, TagResponse, produce))
+
+
+def test_cached_page_until_the_ttl(clock, produce):
+    assert read_page(produce) == b'{"items":[],"next_cursor":null}'
+    clock[0] += response_cache.ttl - 1
+    read_page(produce)
+    assert produce.await_count == 1
+
+    clock[0] += 1
+    read_page(produce)
+    assert produce.await_count == 2
+
+
+def test_writes_invalidate_the_cached_pages(produce):
+    read_page(produce)
+
+    create_tag(TagCreateRequest(name="cached-salsa"))
+
+    read_page(produce)
+    assert produce.await_count == 2
+
+
+def test_page_read_across_a_write_is_not_cached():
+    async def produce():
+        # A write commits while the page is read from the previous state
+        invalidate_responses("tag-1")
+        return [], None
+
+    read_page(produce)
+
+    assert response_cache.stats()["size"] == 0
+
+
+def test_concurrent_identical_reads_share_one_call():
+    calls = 0
+
+    async def produce():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [], None
+
+    async def read_concurrently():
+        reads = [acached_page("tags.public.read", PARAMS, TagResponse, produce) for _ in range(10)]
+        reads.append(acached_page("tags.public.read", {"limit": 10}, TagResponse, produce))
+        return await asyncio.gather(*reads)
+
+    pages = asyncio.run(read_concurrently())
+
+    assert len(set(pages)) == 1
+    # The 10 identical reads and the one of other parameters
+    assert calls == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_flight():
+    flights = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        return "page"
+
+    async def cancel_one():
+        first = asyncio.ensure_future(flights.do("key", call))
+        second = asyncio.ensure_future(flights.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(cancel_one()) == "page"
+    assert flights.stats() == {"in_flight": 0, "calls": 1, "coalesced": 1}
+
+
+def test_failed_flight_is_shared_then_retried():
+    flights = SingleFlight()
+    call = mock.AsyncMock(side_effect=[ValueError, "page"])
+
+    async def read_twice():
+        return await asyncio.gather(
+            flights.do("key", call), flights.do("key", call), return_exceptions=True
+        )
+
+    assert [type(result) for result in asyncio.run(read_twice())] == [ValueError, ValueError]
+    assert asyncio.run(flights.do("key", call)) == "page"
+    assert call.await_count == 2
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import pytest
+from sqlalchemy import event as sqla_event
+
+from hispanie.action import create_event, delete_event, update_event
+from hispanie.db import get_session
+from hispanie.model import Account, AccountType, Event, Ticket
+from hispanie.schema import EventCreateRequest, EventResponse, EventUpdateRequest
+
+
+@pytest.fixture(autouse=True)
+def publish():
+    with mock.patch("hispanie.action.event.publish") as publish:
+        yield publish
+
+
+@pytest.fixture
+def account():
+    return Account(
+        username="organizer",
+        email="organizer@hispanie.com",
+        password="organizer",
+        type=AccountType.USER,
+    ).create()
+
+
+def test_delete_event_returns_the_deleted_aggregate(account):
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    event = create_event(
+        EventCreateRequest(
+            name="Concert",
+            city="Paris",
+            address="1 rue de la Paix",
+            country="France",
+            municipality="Paris",
+            postcode="75001",
+            region="Ile-de-France",
+            latitude=48.8686,
+            longitude=2.3314,
+            category="concert",
+            frequency="none",
+            start_date=start,
+            end_date=start + timedelta(hours=3),
+            tickets=[{"name": f"ticket {i}", "cost": 10.0, "currency": "EUR"} for i in range(2)],
+        ),
+        account.id,
+    )
+
+    response = EventResponse.model_validate(
+        delete_event(event.id, account.id), from_attributes=True
+    ).model_dump()
+
+    assert response["id"] == event.id
+    assert sorted(ticket["name"] for ticket in response["tickets"]) == ["ticket 0", "ticket 1"]
+    assert Event.find(id=event.id) == []
+
+
+@pytest.fixture
+def statements():
+    """Record the statements run by the session of the test."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = get_session().get_bind().engine
+    sqla_event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    sqla_event.remove(engine, "before_cursor_execute", record)
+
+
+def concert(account: Account, tickets: int) -> Event:
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    return create_event(
+        EventCreateRequest(
+            name="Concert",
+            city="Paris",
+            address="1 rue de la Paix",
+            country="France",
+            municipality="Paris",
+            postcode="75001",
+            region="Ile-de-France",
+            latitude=48.8686,
+            longitude=2.3314,
+            category="concert",
+            frequency="none",
+            start_date=start,
+            end_date=start + timedelta(hours=3),
+            tickets=[
+                {"name": f"ticket {i}", "cost": 10.0, "currency": "EUR"} for i in range(tickets)
+            ],
+        ),
+        account.id,
+    )
+
+
+def test_create_event_inserts_the_tickets_at_once(account, statements):
+    event = concert(account, tickets=30)
+
+    assert [s for s in statements if s.startswith("INSERT INTO ticket ")] == [mock.ANY]
+    assert sorted(ticket.name for ticket in event.tickets) == sorted(
+        f"ticket {i}" for i in range(30)
+    )
+    assert len(Ticket.find(event_id=event.id)) == 30
+
+
+def test_update_event_applies_the_tickets_in_one_statement_each(account, statements):
+    event = concert(account, tickets=3)
+    kept, updated, _ = sorted(event.tickets, key=lambda ticket: ticket.name)
+    statements.clear()
+
+    result = update_event(
+        event.id,
+        account.id,
+        EventUpdateRequest(
+            tickets=[
+                {"id": kept.id},
+                {"id": updated.id, "cost": 20.0, "description": "VIP"},
+                *({"name": f"new {i}", "cost": 5.0, "currency": "EUR"} for i in range(2)),
+            ]
+        ),
+    )
+
+    assert [s.split(" ", 3)[:3] for s in statements if s.startswith(("INSERT", "DELETE"))] == [
+        ["DELETE", "FROM", "ticket"],
+        ["INSERT", "INTO", "ticket"],
+    ]
+    assert len([s for s in statements if s.startswith("UPDATE ticket ")]) == 1
+    tickets = {ticket.name: ticket for ticket in Ticket.find(event_id=event.id)}
+    assert sorted(tickets) == ["new 0", "new 1", "ticket 0", "ticket 1"]
+    assert (tickets["ticket 1"].cost, tickets["ticket 1"].description) == (20.0, "VIP")
+    assert sorted(ticket.name for ticket in result.tickets) == sorted(tickets)
@@ -0,0 +1,46 @@
+from unittest import mock
+
+import pytest
+
+from hispanie.action import create_tag, delete_tag, update_tag
+from hispanie.errors import DBError
+from hispanie.model import Tag
+from hispanie.schema import TagCreateRequest, TagUpdateRequest
+
+
+@pytest.fixture(autouse=True)
+def publish():
+    with mock.patch("hispanie.action.tag.publish") as publish:
+        yield publish
+
+
+@pytest.fixture
+def tag():
+    return create_tag(TagCreateRequest(name="salsa"))
+
+
+def test_update_tag_rolls_back_as_a_whole(tag):
+    with (
+        mock.patch("hispanie.action.tag.Business.touch", side_effect=DBError),
+        pytest.raises(DBError),
+    ):
+        update_tag(tag.id, TagUpdateRequest(name="bachata"))
+
+    assert Tag.get(id=tag.id).name == "salsa"
+
+
+def test_delete_tag_rolls_back_as_a_whole(tag):
+    with (
+        mock.patch("hispanie.action.tag.Business.touch", side_effect=DBError),
+        pytest.raises(DBError),
+    ):
+        delete_tag(tag.id)
+
+    assert [t.id for t in Tag.find(id=tag.id)] == [tag.id]
+
+
+def test_delete_tag(tag, publish):
+    delete_tag(tag.id)
+
+    assert Tag.find(id=tag.id) == []
+    publish.assert_called_with("tag", tag.id)
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Request
+
+from hispanie.api.conditional import is_not_modified, validators
+
+LAST_MODIFIED = datetime(2026, 10, 17, 12, 30, 15, 250000, tzinfo=timezone.utc)
+KEY = ("events.public.read", '{"limit": 20}')
+
+
+def make_request(**headers: str) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def test_validators_change_with_the_rows():
+    headers = validators(KEY, LAST_MODIFIED, 10)
+    assert headers["Last-Modified"] == "Sat, 17 Oct 2026 12:30:15 GMT"
+    assert headers["ETag"] != validators(KEY, LAST_MODIFIED, 9)["ETag"]
+    assert headers["ETag"] != validators(KEY, LAST_MODIFIED + timedelta(seconds=1), 10)["ETag"]
+    assert headers["ETag"] != validators((KEY[0], "{}"), LAST_MODIFIED, 10)["ETag"]
+
+
+@pytest.mark.parametrize(
+    "request_headers, expected",
+    [
+        ({}, False),
+        ({"if_none_match": "ETAG"}, True),
+        ({"if_none_match": '"other", ETAG'}, True),
+        ({"if_none_match": "*"}, True),
+        ({"if_none_match": '"other"'}, False),
+        ({"if_modified_since": "Sat, 17 Oct 2026 12:30:15 GMT"}, True),
+        ({"if_modified_since": "Sat, 17 Oct 2026 12:30:14 GMT"}, False),
+        ({"if_modified_since": "not a date"}, False),
+        # If-None-Match takes precedence over If-Modified-Since
+        ({"if_none_match": '"other"', "if_modified_since": "Sat, 17 Oct 2026 13:00:00 GMT"}, False),
+    ],
+)
+def test_is_not_modified(request_headers, expected):
+    headers = validators(KEY, LAST_MODIFIED, 10)
+    request_headers = {
+        name: value.replace("ETAG", headers["ETag"]) for name, value in request_headers.items()
+    }
+    assert is_not_modified(make_request(**request_headers), headers) is expected
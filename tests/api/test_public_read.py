@@ -0,0 +1,37 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from hispanie.action import aread_businesses, aread_events
+from hispanie.model import Business, Event
+
+CASES = [
+    ("/api/v1/events/public/read", Event, "hispanie.api.routers.event.aversion_events"),
+    (
+        "/api/v1/businesses/public/read",
+        Business,
+        "hispanie.api.routers.business.aversion_businesses",
+    ),
+]
+
+
+@pytest.mark.parametrize("path, model, version", CASES)
+def test_read_one_public_hides_the_private_rows(client, path, model, version):
+    row = model(id=f"{model.__tablename__}-private", is_public=False)
+    with (
+        mock.patch(version, mock.AsyncMock(return_value=(None, 0))) as aversion,
+        mock.patch.object(model, "aget", mock.AsyncMock(return_value=row)),
+    ):
+        response = client.get(f"{path}/{row.id}")
+
+    assert response.status_code == 400
+    assert f"no-{model.__tablename__}-found" in response.json()["detail"]
+    aversion.assert_awaited_once_with(id=row.id, is_public=True)
+
+
+@pytest.mark.parametrize("read, model", [(aread_events, Event), (aread_businesses, Business)])
+def test_read_public_returns_the_public_rows(read, model):
+    row = model(id=f"{model.__tablename__}-public", is_public=True)
+    with mock.patch.object(model, "aget", mock.AsyncMock(return_value=row)):
+        assert asyncio.run(read(row.id, public=True)) is row
@@ -0,0 +1,47 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from hispanie.action import get_current_account
+from hispanie.api.routers import activity, business, event, file, tag, ticket
+from hispanie.model import AccountType, Tag
+from hispanie.schema import AccountPrincipal
+
+
+@pytest.fixture
+def principal(client):
+    principal = AccountPrincipal(id="account-1", username="organizer", type=AccountType.USER)
+    client.app.dependency_overrides[get_current_account] = lambda: principal
+    yield principal
+    client.app.dependency_overrides.clear()
+
+
+@pytest.mark.parametrize("module", [activity, business, event, file, tag, ticket])
+def test_write_routes_run_in_the_threadpool(module):
+    # The write actions use the blocking session, they must not run on the event loop
+    routes = [
+        route
+        for route in module.router.routes
+        if "/private/" in route.path and route.methods & {"POST", "PUT", "DELETE"}
+    ]
+    assert len(routes) == 3
+    for route in routes:
+        assert not asyncio.iscoroutinefunction(route.endpoint), route.path
+
+
+def test_create_tag_off_the_event_loop(client, principal):
+    loops = []
+
+    def publish(entity, id):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+
+    with mock.patch("hispanie.action.tag.publish", publish):
+        response = client.post("/api/v1/tags/private/create", json={"name": "salsa"})
+
+    assert response.status_code == 200
+    assert Tag.get(id=response.json()["id"]).name == "salsa"
+    assert loops == [None]
@@ -0,0 +1,66 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.dialects import postgresql
+
+from hispanie.db import get_session
+from hispanie.model import Tag
+
+DATES = {
+    "morning": datetime(2026, 10, 17, 10, 0, tzinfo=timezone.utc),
+    "midnight": datetime(2026, 10, 17, 23, 59, 59, 999999, tzinfo=timezone.utc),
+    "next day": datetime(2026, 10, 18, 0, 0, tzinfo=timezone.utc),
+}
+
+
+@pytest.fixture(autouse=True)
+def tags():
+    tags = {name: Tag(name=f"filter-tag {name}").create() for name in DATES}
+    session = get_session()
+    # Days start at midnight of the time zone of the connection
+    session.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+    for name, creation_date in DATES.items():
+        session.execute(
+            update(Tag).where(Tag.id == tags[name].id).values(creation_date=creation_date)
+        )
+    session.expire_all()
+    return tags
+
+
+def names(**filters) -> list[str]:
+    tags = Tag.find(name__ilike="filter-tag %", order_by=["creation_date"], **filters)
+    return [tag.name.removeprefix("filter-tag ") for tag in tags]
+
+
+def test_day_equality_matches_the_whole_day():
+    assert names(creation_date=date(2026, 10, 17)) == ["morning", "midnight"]
+    assert names(creation_date=[date(2026, 10, 17), DATES["next day"]]) == list(DATES)
+    assert names(**{"!creation_date": date(2026, 10, 17)}) == ["next day"]
+
+
+def test_day_equality_is_a_range_of_the_column():
+    query = Tag._select(creation_date=date(2026, 10, 17))
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "tag.creation_date >= " in sql
+    assert "tag.creation_date < " in sql
+    assert "CAST" not in sql
+
+
+def test_gte():
+    assert names(creation_date__gte=DATES["midnight"]) == ["midnight", "next day"]
+    assert names(creation_date__gte=DATES["next day"]) == ["next day"]
+
+
+def test_in(tags):
+    ids = [tags["morning"].id, tags["next day"].id]
+
+    assert names(id__in=ids) == ["morning", "next day"]
+    assert names(**{"!id__in": ids}) == ["midnight"]
+    assert names(id__in=[]) == []
+
+
+def test_unknown_operator():
+    with pytest.raises(ValueError):
+        Tag.find(creation_date__after=DATES["morning"])
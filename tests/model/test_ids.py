@@ -0,0 +1,59 @@
+import re
+import uuid
+from unittest import mock
+
+import pytest
+
+from hispanie.model import Tag
+from hispanie.utils import idun, uuid7_hex
+
+NOW_NS = 1_792_238_415_250_000_000
+
+
+@pytest.fixture(autouse=True)
+def state():
+    """Keep the ids generated at the mocked times out of the ones of the other tests."""
+    with mock.patch("hispanie.utils._uuid7_state", (0, 0)):
+        yield
+
+
+def test_ids_are_prefixed_uuid7():
+    id = idun("tag")
+
+    assert re.fullmatch(r"tag-[0-9a-f]{32}", id)
+    value = uuid.UUID(id.removeprefix("tag-"))
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_ids_embed_the_time():
+    with mock.patch("hispanie.utils.time.time_ns", return_value=NOW_NS):
+        value = int(uuid7_hex(), 16)
+
+    assert value >> 80 >= NOW_NS // 1_000_000
+
+
+def test_ids_of_the_same_millisecond_are_ordered():
+    # More ids than the counter holds in one millisecond
+    with mock.patch("hispanie.utils.time.time_ns", return_value=NOW_NS):
+        ids = [uuid7_hex() for _ in range(5000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_ids_are_ordered_when_the_clock_moves_backwards():
+    with mock.patch("hispanie.utils.time.time_ns", return_value=NOW_NS):
+        before = uuid7_hex()
+    with mock.patch("hispanie.utils.time.time_ns", return_value=NOW_NS - 10_000_000_000):
+        after = uuid7_hex()
+
+    assert before < after
+
+
+def test_rows_sort_by_id_in_creation_order():
+    tags = [Tag(name=f"id-tag-{i}").create() for i in range(20)]
+
+    found = Tag.find(name__ilike="id-tag-%", order_by=["id"])
+
+    assert [tag.id for tag in found] == [tag.id for tag in tags]
@@ -0,0 +1,272 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+from unittest import mock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from hispanie.action import (
+    apaginate_activities,
+    apaginate_businesses,
+    apaginate_events,
+    apaginate_files,
+    apaginate_tags,
+    apaginate_tickets,
+    aversion_events,
+    shift_periodic_events,
+)
+from hispanie.schema import BusinessFilterParams, EventFilterParams
+from hispanie.utils import encode_cursor
+
+ACCOUNTS = 100
+EVENTS_PER_ACCOUNT = 50
+BUSINESSES_PER_ACCOUNT = 100
+ACTIVITIES_PER_EVENT = 3
+TICKETS_PER_EVENT = 2
+TAGS = 10000
+LIMIT = 50
+
+
+@pytest.fixture
+def session(mock_session):
+    with mock_session() as session:
+        session.execute(
+            text(
+                "INSERT INTO account (id, username, email, type, password, creation_date) "
+                "SELECT 'account-' || a, 'user' || a, 'user' || a || '@hispanie.com', 'USER', "
+                "'\\x00', now() FROM generate_series(1, :accounts) AS a"
+            ),
+            {"accounts": ACCOUNTS},
+        )
+        # One event in ten is public, one in a hundred recurs weekly
+        session.execute(
+            text(
+                "INSERT INTO event (id, name, category, frequency, start_date, end_date, "
+                "is_public, city, account_id, creation_date) "
+                "SELECT 'event-' || e, 'event ' || e, 'CONCERT', "
+                "(CASE WHEN e % 100 = 0 THEN 'WEEKLY' ELSE 'NONE' END)::eventfrequency, "
+                "now() + e * interval '1 hour', "
+                "now() + e * interval '1 hour' + interval '2 hours', "
+                "e % 10 = 0, 'Paris', 'account-' || (e % :accounts + 1), now() "
+                "FROM generate_series(1, :events) AS e"
+            ),
+            {"accounts": ACCOUNTS, "events": ACCOUNTS * EVENTS_PER_ACCOUNT},
+        )
+        session.execute(
+            text(
+                "INSERT INTO activity (id, name, start_date, end_date, event_id, creation_date) "
+                "SELECT 'activity-' || e || '-' || a, 'activity ' || a, event.start_date, "
+                "event.end_date, event.id, now() - a * interval '1 minute' "
+                "FROM generate_series(1, :events) AS e JOIN event ON event.id = 'event-' || e, "
+                "generate_series(1, :activities) AS a"
+            ),
+            {"events": ACCOUNTS * EVENTS_PER_ACCOUNT, "activities": ACTIVITIES_PER_EVENT},
+        )
+        session.execute(
+            text(
+                "INSERT INTO ticket (id, name, cost, currency, event_id, creation_date) "
+                "SELECT 'ticket-' || e || '-' || t, 'ticket ' || t, 10, 'EUR', 'event-' || e, "
+                "now() - t * interval '1 minute' "
+                "FROM generate_series(1, :events) AS e, generate_series(1, :tickets) AS t"
+            ),
+            {"events": ACCOUNTS * EVENTS_PER_ACCOUNT, "tickets": TICKETS_PER_EVENT},
+        )
+        session.execute(
+            text(
+                "INSERT INTO business (id, name, category, is_public, account_id, creation_date) "
+                "SELECT 'business-' || b, 'business ' || b, 'CAFE', true, "
+                "'account-' || (b % :accounts + 1), now() - b * interval '1 minute' "
+                "FROM generate_series(1, :businesses) AS b"
+            ),
+            {"accounts": ACCOUNTS, "businesses": ACCOUNTS * BUSINESSES_PER_ACCOUNT},
+        )
+        session.execute(
+            text(
+                "INSERT INTO file (id, filename, content_type, category, path, hash, account_id, "
+                "event_id, creation_date) "
+                "SELECT 'file-' || f, 'file' || f, 'image/png', 'COVER_IMAGE', 'path', 'hash', "
+                "'account-' || (f % :accounts + 1), 'event-' || f, "
+                "now() - f * interval '1 minute' FROM generate_series(1, :events) AS f"
+            ),
+            {"accounts": ACCOUNTS, "events": ACCOUNTS * EVENTS_PER_ACCOUNT},
+        )
+        session.execute(
+            text(
+                "INSERT INTO tag (id, name, creation_date) "
+                "SELECT 'tag-' || t, 'tag ' || t, now() - t * interval '1 minute' "
+                "FROM generate_series(1, :tags) AS t"
+            ),
+            {"tags": TAGS},
+        )
+        for table in ("account", "event", "business", "file", "tag", "activity", "ticket"):
+            session.execute(text(f"ANALYZE {table}"))
+        yield session
+
+
+def plan_nodes(session, query) -> list[str]:
+    """Return the node types of the plan of `query`, with the name of their index."""
+    sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    [[plan]] = session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).one()
+
+    def walk(node):
+        yield " ".join(filter(None, [node["Node Type"], node.get("Index Name")]))
+        for child in node.get("Plans", []):
+            yield from walk(child)
+
+    return list(walk(plan["Plan"]))
+
+
+class RecordingSession:
+    """Session recording the statements instead of running them, they match no rows."""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return mock.Mock(**{"unique.return_value": [], "one.return_value": (None, 0)})
+
+    scalars = execute
+
+    async def aexecute(self, statement):
+        return self.execute(statement)
+
+    @asynccontextmanager
+    async def async_scope(self):
+        yield mock.Mock(scalars=self.aexecute, execute=self.aexecute)
+
+    @contextmanager
+    def scope(self):
+        yield self
+
+
+def recorded_statements(call: Callable[[], Any]) -> list[Any]:
+    """Return the statements run by the action `call`, awaited when it is a coroutine."""
+    session = RecordingSession()
+    with (
+        mock.patch("hispanie.db.async_session_scope", session.async_scope),
+        mock.patch("hispanie.action.event.session_scope", session.scope),
+        mock.patch("hispanie.action.event.transaction", session.scope),
+        mock.patch("hispanie.action.event.publish"),
+    ):
+        if asyncio.iscoroutine(result := call()):
+            asyncio.run(result)
+    return session.statements
+
+
+def now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def read_events(params: EventFilterParams, **kwargs) -> Awaitable[Any]:
+    """Return the call of the events list routers."""
+    return apaginate_events(params.limit, params.cursor, **kwargs, **params.filters())
+
+
+def read_businesses(params: BusinessFilterParams, **kwargs) -> Awaitable[Any]:
+    """Return the call of the businesses list routers."""
+    return apaginate_businesses(params.limit, params.cursor, **kwargs, **params.filters())
+
+
+def public_events(**params) -> EventFilterParams:
+    """Return the parameters of the public events starting on the third day."""
+    return EventFilterParams(
+        limit=LIMIT,
+        is_public=True,
+        start_date_gte=now() + timedelta(days=2),
+        start_date_lt=now() + timedelta(days=3),
+        **params,
+    )
+
+
+EVENTS_CURSOR = encode_cursor([now() + timedelta(days=2, hours=6), "event-54"])
+BUSINESSES_CURSOR = encode_cursor([now() - timedelta(hours=2), "business-120"])
+TAGS_CURSOR = encode_cursor([now() - timedelta(hours=2), "tag-120"])
+
+# Main query of every list router, built through the same parameters and actions, and the index
+# serving it
+ROUTER_CALLS = {
+    "events public": (
+        "ix_event_start_date",
+        lambda: read_events(EventFilterParams(limit=LIMIT)),
+    ),
+    "events public of a day": (
+        "ix_event_is_public_start_date",
+        lambda: read_events(public_events()),
+    ),
+    "events public version": (
+        "ix_event_is_public_start_date",
+        lambda: aversion_events(**public_events().filters()),
+    ),
+    "events public next page": (
+        "ix_event_is_public_start_date",
+        lambda: read_events(public_events(cursor=EVENTS_CURSOR)),
+    ),
+    "events public descending": (
+        "ix_event_is_public_start_date",
+        lambda: read_events(public_events(order_by="-start_date")),
+    ),
+    "events private": (
+        "ix_event_account_id",
+        lambda: read_events(
+            EventFilterParams(limit=LIMIT, cursor=EVENTS_CURSOR), account_id="account-1"
+        ),
+    ),
+    "businesses public": (
+        "ix_business_creation_date_id",
+        lambda: read_businesses(BusinessFilterParams(limit=LIMIT)),
+    ),
+    "businesses public next page": (
+        "ix_business_creation_date_id",
+        lambda: read_businesses(
+            BusinessFilterParams(limit=LIMIT, is_public=True, cursor=BUSINESSES_CURSOR)
+        ),
+    ),
+    "businesses private": (
+        "ix_business_account_id",
+        lambda: read_businesses(BusinessFilterParams(limit=LIMIT), account_id="account-1"),
+    ),
+    "files public": (
+        "ix_file_creation_date_id",
+        lambda: apaginate_files(LIMIT, None, public=True),
+    ),
+    "files private": (
+        "ix_file_account_id",
+        lambda: apaginate_files(LIMIT, None, account_id="account-1"),
+    ),
+    "tags": ("ix_tag_creation_date_id", lambda: apaginate_tags(LIMIT, None)),
+    "tags next page": ("ix_tag_creation_date_id", lambda: apaginate_tags(LIMIT, TAGS_CURSOR)),
+    "activities": (
+        "unique_activity_name_for_event",
+        lambda: apaginate_activities(LIMIT, None, event_id="event-1"),
+    ),
+    "tickets": (
+        "unique_ticket_name_for_event",
+        lambda: apaginate_tickets(LIMIT, None, event_id="event-1"),
+    ),
+}
+
+
+def uses_index(nodes: list[str], index: str) -> bool:
+    return any(
+        node.startswith(("Index", "Bitmap Index")) and node.endswith(f" {index}") for node in nodes
+    )
+
+
+@pytest.mark.parametrize("index, call", ROUTER_CALLS.values(), ids=ROUTER_CALLS.keys())
+def test_list_routers_use_their_index(session, index, call):
+    # The first statement selects the page, the collections are then loaded by its ids
+    [query, *_] = recorded_statements(call)
+    nodes = plan_nodes(session, query)
+    assert uses_index(nodes, index), nodes
+
+
+def test_recurring_events_roll_forward_uses_the_frequency_index(session):
+    statements = recorded_statements(shift_periodic_events)
+    assert statements
+    for statement in statements:
+        nodes = plan_nodes(session, statement)
+        assert uses_index(nodes, "ix_event_frequency"), nodes
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import update
+
+from hispanie.db import get_session
+from hispanie.model import Tag
+from hispanie.utils import decode_cursor, encode_cursor
+
+CREATION_DATE = datetime(2026, 10, 17, 12, 30, 15, 250000, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def tag_ids():
+    """Seven tags created at the very same date, only their id tells them apart."""
+    tags = [Tag(name=f"page-tag-{i}").create() for i in range(7)]
+    session = get_session()
+    session.execute(
+        update(Tag).where(Tag.name.like("page-tag-%")).values(creation_date=CREATION_DATE)
+    )
+    session.expire_all()
+    return [tag.id for tag in tags]
+
+
+def read_pages(limit: int, **filters) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        items, cursor = Tag.paginate(limit, cursor, name__ilike="page-tag-%", **filters)
+        pages.append([tag.id for tag in items])
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor([CREATION_DATE, "tag-1"])
+
+    date, id = decode_cursor(cursor)
+
+    assert "=" not in cursor
+    assert datetime.fromisoformat(date) == CREATION_DATE
+    assert id == "tag-1"
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+    with pytest.raises(ValueError):
+        Tag.paginate(3, encode_cursor(["tag-1"]))
+
+
+def test_pages_break_the_ties_on_the_id(tag_ids):
+    pages = read_pages(3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [id for page in pages for id in page] == sorted(tag_ids)
+
+
+def test_descending_pages_break_the_ties_on_the_id(tag_ids):
+    pages = read_pages(3, order_by=["-creation_date"])
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [id for page in pages for id in page] == sorted(tag_ids, reverse=True)
+
+
+def test_last_full_page_has_no_cursor(tag_ids):
+    items, cursor = Tag.paginate(7, None, name__ilike="page-tag-%")
+
+    assert len(items) == 7
+    assert cursor is None